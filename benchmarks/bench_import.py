@@ -0,0 +1,47 @@
+"""
+Cold `import parolo` time, measured in fresh interpreters.
+
+Prints one JSON line with the median/min over --runs of `python -c "import parolo"`
+minus a bare interpreter start, and the heavy modules the import pulled in.
+With --max-ms it exits non-zero when the median exceeds the budget (CI guard).
+
+    python benchmarks/bench_import.py --runs 20 --max-ms 40
+"""
+from __future__ import annotations
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = str(Path(__file__).resolve().parents[1])
+HEAVY = ["jinja2", "concurrent.futures", "multiprocessing", "ctypes", "sqlite3", "asyncio", "parolo.tenants"]
+
+def _time(code: str) -> float:
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=ROOT)
+    return (time.perf_counter() - t0) * 1000
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--runs", type=int, default=10)
+    ap.add_argument("--max-ms", type=float, default=None)
+    args = ap.parse_args()
+
+    _time("import parolo")  # warm the bytecode cache
+    bare = statistics.median(_time("pass") for _ in range(args.runs))
+    runs = [_time("import parolo") - bare for _ in range(args.runs)]
+    loaded = subprocess.run(
+        [sys.executable, "-c", f"import sys, parolo; print(' '.join(m for m in {HEAVY!r} if m in sys.modules))"],
+        check=True, cwd=ROOT, capture_output=True, text=True).stdout.split()
+    median = statistics.median(runs)
+    print(json.dumps({"bench": "import_parolo", "runs": args.runs, "median_ms": round(median, 2),
+                      "min_ms": round(min(runs), 2), "interpreter_ms": round(bare, 2),
+                      "heavy_modules": loaded}))
+    if args.max_ms is not None and median > args.max_ms:
+        sys.exit(f"import parolo took {median:.1f} ms (budget {args.max_ms} ms)")
+
+if __name__ == "__main__":
+    main()
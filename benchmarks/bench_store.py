@@ -0,0 +1,179 @@
+"""
+Store benchmark: generate a synthetic store and time the read/write API.
+
+Builds (or reuses, via --store) `--prompts` prompts with `--versions` versions
+each plus `--tenants` tenant keys with `--tenant-versions` semvers, then runs
+every operation for `--seconds` in 1..N processes. Prints one JSON object per
+line: a "meta" record (scale, backend, python) followed by one record per
+(op, procs) with ops/s and latency percentiles in microseconds.
+
+    python benchmarks/bench_store.py --prompts 10000 --versions 100 --tenants 100000 \\
+        --store /tmp/parolo-bench --procs 1 4 > before.json
+    python benchmarks/bench_store.py --compare before.json after.json
+"""
+from __future__ import annotations
+import argparse
+import json
+import multiprocessing as mp
+import platform
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from parolo import prompts, tenants  # noqa: E402
+from parolo import _core  # noqa: E402
+
+OPS = ["get", "get_version", "render", "list_versions_meta", "list_all",
+       "tenants_read_semver", "tenants_read_cached", "put_unchanged", "put_changed"]
+
+def _text(i: int, v: int) -> str:
+    return (f"You are assistant #{i}, revision {v}.\n"
+            "Answer {{ customer }} about order {{ order_id }} politely.\n"
+            + "Keep the answer short and accurate.\n" * 8)
+
+def _semver(v: int) -> str:
+    return f"1.{v // 10}.{v % 10}"
+
+def _use(args) -> None:
+    _core.set_base_dir(Path(args.store) / "files")
+    if args.backend == "sqlite":
+        from parolo.sqlite_store import SQLiteBackend
+        prompts.use_backend(SQLiteBackend(Path(args.store) / "prompts.db"))
+    elif args.backend == "memory":
+        from parolo.memory_store import MemoryBackend
+        prompts.use_backend(MemoryBackend(_core.FileBackend(_core.BASE_DIR)))
+
+def _scale(args) -> Dict[str, int]:
+    return {"prompts": args.prompts, "versions": args.versions,
+            "tenants": args.tenants, "tenant_versions": args.tenant_versions}
+
+def generate(args) -> float:
+    """Create the store unless --store already holds one of the same scale; returns seconds."""
+    kind = "sqlite" if args.backend == "sqlite" else "file"  # memory reads through the file store
+    marker = Path(args.store) / f"bench-{kind}.json"
+    if marker.exists() and json.loads(marker.read_text()) == _scale(args):
+        return 0.0
+    _use(args)
+    t0 = time.perf_counter()
+    batch: List[tuple] = []
+
+    def flush():
+        prompts.save_many(batch)
+        batch.clear()
+
+    for i in range(args.prompts):
+        batch.extend((f"p{i}", _text(i, v)) for v in range(args.versions))
+        if len(batch) >= 5000:
+            flush()
+    for i in range(args.tenants):
+        batch.extend((tenants.key(f"t{i}", "agent"), _text(i, v), {"semver": _semver(v)})
+                     for v in range(args.tenant_versions))
+        if len(batch) >= 5000:
+            flush()
+    flush()
+    marker.write_text(json.dumps(_scale(args)))
+    return time.perf_counter() - t0
+
+def _ops(args, rng: random.Random, proc: int) -> Dict[str, Callable[[], object]]:
+    P, V, T, TV = args.prompts, args.versions, args.tenants, args.tenant_versions
+    edits = iter(range(10 ** 9))
+    return {
+        "get": lambda: prompts.read(f"p{rng.randrange(P)}"),
+        "get_version": lambda: prompts.read_version(f"p{rng.randrange(P)}", f"v{rng.randrange(V) + 1:04d}"),
+        "render": lambda: prompts.render(f"p{rng.randrange(P)}", customer="Ada", order_id=42),
+        "list_versions_meta": lambda: prompts.versions(f"p{rng.randrange(P)}", with_meta=True),
+        "list_all": lambda: prompts.list(),
+        "tenants_read_semver": lambda: tenants.read(f"t{rng.randrange(T)}", "agent",
+                                                    semver=_semver(rng.randrange(TV))),
+        "tenants_read_cached": lambda: tenants.read_cached(f"t{rng.randrange(T)}", "agent"),
+        "put_unchanged": lambda: prompts.save(f"p{(i := rng.randrange(P))}", _text(i, V - 1)),
+        # changed saves go to per-process prompts so the generated store stays reusable
+        "put_changed": lambda: prompts.save(f"bench_w{proc}", f"edit {next(edits)}\n" + _text(0, 0)),
+    }
+
+def _measure(args, op: str, proc: int, start, out) -> None:
+    _use(args)
+    rng = random.Random(proc)
+    fn = _ops(args, rng, proc)[op]
+    start.wait()
+    lat: List[int] = []
+    end = time.perf_counter() + args.seconds
+    while time.perf_counter() < end and len(lat) < args.max_ops:
+        t0 = time.perf_counter_ns()
+        fn()
+        lat.append(time.perf_counter_ns() - t0)
+    out.put(lat)
+
+def _pct(sorted_ns: List[int], q: float) -> float:
+    return round(sorted_ns[min(len(sorted_ns) - 1, int(q * len(sorted_ns)))] / 1000, 1)
+
+def run(args, op: str, procs: int) -> dict:
+    ctx = mp.get_context()
+    start, out = ctx.Event(), ctx.Queue()
+    ps = [ctx.Process(target=_measure, args=(args, op, w, start, out)) for w in range(procs)]
+    for p in ps:
+        p.start()
+    t0 = time.perf_counter()
+    start.set()
+    lats = [out.get() for _ in ps]
+    wall = time.perf_counter() - t0
+    for p in ps:
+        p.join()
+    lat = sorted(x for per_thread in lats for x in per_thread)
+    return {"bench": op, "backend": args.backend, "procs": procs, "ops": len(lat),
+            "ops_per_s": round(len(lat) / wall, 1), "p50_us": _pct(lat, 0.50),
+            "p95_us": _pct(lat, 0.95), "p99_us": _pct(lat, 0.99), "max_us": _pct(lat, 1.0)}
+
+def compare(old_path: str, new_path: str) -> None:
+    """Print new/old ops_per_s and p50 ratios for every bench present in both files."""
+    def load(p):
+        rows = [json.loads(line) for line in Path(p).read_text().splitlines() if line.strip()]
+        return {(r["bench"], r.get("backend"), r.get("procs")): r for r in rows if "ops_per_s" in r}
+    old, new = load(old_path), load(new_path)
+    for k in sorted(old.keys() & new.keys(), key=str):
+        o, n = old[k], new[k]
+        print(json.dumps({"bench": k[0], "backend": k[1], "procs": k[2],
+                          "ops_per_s_ratio": round(n["ops_per_s"] / o["ops_per_s"], 3),
+                          "p50_ratio": round(n["p50_us"] / o["p50_us"], 3) if o["p50_us"] else None}))
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--store", default=None, help="store directory (kept between runs)")
+    ap.add_argument("--backend", choices=["file", "sqlite", "memory"], default="file")
+    ap.add_argument("--prompts", type=int, default=1000)
+    ap.add_argument("--versions", type=int, default=20)
+    ap.add_argument("--tenants", type=int, default=1000)
+    ap.add_argument("--tenant-versions", type=int, default=5)
+    ap.add_argument("--procs", type=int, nargs="+", default=[1, 4])
+    ap.add_argument("--ops", nargs="+", choices=OPS, default=OPS)
+    ap.add_argument("--seconds", type=float, default=2.0)
+    ap.add_argument("--max-ops", type=int, default=100_000)
+    ap.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    args = ap.parse_args()
+    if args.compare:
+        compare(*args.compare)
+        return
+    if args.store is None:
+        with tempfile.TemporaryDirectory(prefix="parolo-bench-") as tmp:
+            args.store = tmp
+            bench(args)
+    else:
+        Path(args.store).mkdir(parents=True, exist_ok=True)
+        bench(args)
+
+def bench(args) -> None:
+    gen_s = generate(args)
+    print(json.dumps({"bench": "meta", "backend": args.backend, **_scale(args),
+                      "generate_s": round(gen_s, 2), "python": platform.python_version(),
+                      "platform": platform.platform(), "cpus": mp.cpu_count()}), flush=True)
+    for op in args.ops:
+        for n in args.procs:
+            print(json.dumps(run(args, op, n)), flush=True)
+    prompts.use_backend(None)
+
+if __name__ == "__main__":
+    main()
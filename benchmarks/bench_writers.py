@@ -0,0 +1,64 @@
+"""
+Multi-process writer stress benchmark for put().
+
+Each process saves `--saves` changed texts. In "distinct" mode every process owns
+its prompt (throughput should scale with processes: no shared lock); in "shared"
+mode all processes hit one prompt and the run verifies no version was lost.
+
+    python benchmarks/bench_writers.py --procs 1 2 4 8 --saves 500 > writers.json
+"""
+from __future__ import annotations
+import argparse
+import json
+import multiprocessing as mp
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from parolo import _core  # noqa: E402
+
+def _worker(base: str, prompt: str, worker: int, saves: int, start, out) -> None:
+    _core.set_base_dir(base)
+    start.wait()
+    t0 = time.perf_counter()
+    for i in range(saves):
+        _core.put(prompt, f"worker {worker} edit {i}\n" * 8)
+    out.put(time.perf_counter() - t0)
+
+def run(procs: int, saves: int, mode: str) -> dict:
+    ctx = mp.get_context()
+    with tempfile.TemporaryDirectory() as base:
+        start, out = ctx.Event(), ctx.Queue()
+        ps = [ctx.Process(target=_worker, args=(base, "shared" if mode == "shared" else f"p{w}",
+                                                  w, saves, start, out)) for w in range(procs)]
+        for p in ps:
+            p.start()
+        t0 = time.perf_counter()
+        start.set()
+        for p in ps:
+            p.join()
+        wall = time.perf_counter() - t0
+        per_proc = [out.get() for _ in ps]
+        _core.set_base_dir(base)
+        names = ["shared"] if mode == "shared" else [f"p{w}" for w in range(procs)]
+        versions = sum(len(_core.list_versions(n)) for n in names)
+    total = procs * saves
+    return {"bench": "put_writers", "mode": mode, "procs": procs, "saves": total,
+            "versions": versions, "lost": total - versions, "wall_s": round(wall, 4),
+            "saves_per_s": round(total / wall, 1), "max_proc_s": round(max(per_proc), 4)}
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--procs", type=int, nargs="+", default=[1, 2, 4, 8])
+    ap.add_argument("--saves", type=int, default=300)
+    ap.add_argument("--mode", choices=["distinct", "shared", "both"], default="both")
+    args = ap.parse_args()
+    modes = ["distinct", "shared"] if args.mode == "both" else [args.mode]
+    for mode in modes:
+        for n in args.procs:
+            print(json.dumps(run(n, args.saves, mode)), flush=True)
+
+if __name__ == "__main__":
+    main()
@@ -1,40 +1,95 @@
+import os as _os
+
 from .prompt import Prompt
 __all__ = ["Prompt"]
 
 # keep your guarded prompts facade
 try:
+    import importlib
+    import os
     from types import SimpleNamespace
     from ._core import (
         set_base_dir, put, get, get_version, list_all, list_versions,
-        meta_version, token, template, render, render_version, jinja_variables,
+        meta_version, token, template, render, render_version, render_checked, jinja_variables,
+        render_stream, render_version_stream, render_to, precompile, use_code_cache,
+        use_composition, validate, MissingVariablesError, dependencies,
+        template_cache_info, clear_template_cache, rebuild_index, invalidate,
+        read_many, render_many, save_many, use_blobs, migrate_blobs, gc_blobs,
+        pack, pack_all, use_backend, get_backend, generation, changes_since, compact_journal,
+        use_deltas, use_compression, version_cache_info,
     )
-    prompts = SimpleNamespace(
+    from . import metrics
+
+    class _LazyNamespace(SimpleNamespace):
+        """SimpleNamespace whose `_lazy` attributes ({name: "module:attr"}) are imported on first use."""
+
+        def __getattr__(self, name):
+            target = self.__dict__.get("_lazy", {}).get(name)
+            if target is None:
+                raise AttributeError(name)
+            module, _, attr = target.partition(":")
+            value = getattr(importlib.import_module(module, __name__), attr)
+            setattr(self, name, value)
+            return value
+
+        def __dir__(self):
+            return sorted(set(self.__dict__) | set(self.__dict__.get("_lazy", {})))
+
+    # watch (ctypes/inotify) and bundles are imported when first used
+    prompts = _LazyNamespace(
         save=put, read=get, read_version=get_version, list=list_all,
         versions=list_versions, meta=meta_version, token=token,
-        template=template, render=render, render_version=render_version, vars=jinja_variables,
+        template=template, render=render, render_version=render_version, render_checked=render_checked,
+        vars=jinja_variables,
+        render_stream=render_stream, render_version_stream=render_version_stream, render_to=render_to,
+        precompile=precompile, use_code_cache=use_code_cache, use_composition=use_composition,
+        validate=validate, MissingVariablesError=MissingVariablesError, dependencies=dependencies,
         set_base_dir=set_base_dir,
+        cache_info=template_cache_info, cache_clear=clear_template_cache,
+        rebuild_index=rebuild_index, invalidate=invalidate,
+        read_many=read_many, render_many=render_many, save_many=save_many,
+        use_blobs=use_blobs, migrate_blobs=migrate_blobs, gc_blobs=gc_blobs,
+        pack=pack, pack_all=pack_all, use_deltas=use_deltas, use_compression=use_compression,
+        version_cache_info=version_cache_info,
+        use_backend=use_backend, backend=get_backend,
+        generation=generation, changes_since=changes_since, compact_journal=compact_journal,
+        stats=metrics.stats, instrument=metrics.enable, trace=metrics.add_tracer,
+        _lazy={
+            "watch": ".watch:watch",
+            "export_bundle": ".bundle:export_bundle",
+            "open_bundle": ".bundle:open_bundle",
+            "close_bundle": ".bundle:close_bundle",
+        },
     )
-    __all__.extend(["prompts", "set_base_dir"])
-
-    # expose tenants helpers
-    from .tenants import (
-        key as tenants_key,
-        list_semvers as tenants_list_semvers,
-        latest_semver as tenants_latest_semver,
-        save as tenants_save,
-        read as tenants_read,
-        ensure_initial as tenants_ensure_initial,
-        read_cached as tenants_read_cached,
-    )
-    tenants = SimpleNamespace(
-        key=tenants_key,
-        list_semvers=tenants_list_semvers,
-        latest_semver=tenants_latest_semver,
-        save=tenants_save,
-        read=tenants_read,
-        ensure_initial=tenants_ensure_initial,
-        read_cached=tenants_read_cached,
-    )
-    __all__.append("tenants")
+    __all__.extend(["prompts", "set_base_dir", "tenants", "MissingVariablesError"])
+
+    # tenants helpers: the namespace is built on first access of parolo.tenants
+    def __getattr__(name):
+        if name != "tenants":
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+        mod = importlib.import_module(".tenants", __name__)
+        ns = SimpleNamespace(
+            key=mod.key,
+            list_semvers=mod.list_semvers,
+            latest_semver=mod.latest_semver,
+            save=mod.save,
+            read=mod.read,
+            ensure_initial=mod.ensure_initial,
+            read_cached=mod.read_cached,
+            resolve=mod.resolve,
+            invalidate=mod.invalidate,
+            configure_cache=mod.configure_cache,
+            cache_info=mod.cache_info,
+        )
+        globals()["tenants"] = ns  # replaces the submodule the import bound here
+        return ns
 except Exception:
     pass
+
+# outside the guard: a read-only deployment must not silently fall back to the writable store
+if _os.environ.get("PAROLO_BUNDLE"):
+    try:
+        prompts.open_bundle(_os.environ["PAROLO_BUNDLE"])
+    except Exception as e:
+        e.add_note(f"parolo: cannot serve PAROLO_BUNDLE={_os.environ['PAROLO_BUNDLE']!r}")
+        raise
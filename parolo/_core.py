@@ -1,177 +1,1565 @@
 from __future__ import annotations
+import abc
+import copy
+import functools
+import io
 import os
+import sys
 import json
+import marshal
 import tempfile
 import hashlib
+import mmap
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Mapping, Optional
+
+try:  # per-prompt advisory write locks
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from . import metrics as _metrics
 
 # Base dir (same default as before)
 BASE_DIR = Path(os.environ.get("PAROLO_HOME", Path.home() / ".parolo" / "prompts")).resolve()
 
-# Jinja2 is optional: class API stays on str.format; function render() uses Jinja if present
-try:
-    from jinja2 import Environment, StrictUndefined, meta
-    _JENV = Environment(undefined=StrictUndefined, trim_blocks=True, lstrip_blocks=True)
-    _JINJA_OK = True
-except Exception:
-    _JENV = None
-    _JINJA_OK = False
+# Jinja2 is optional: class API stays on str.format; function render() uses Jinja if present.
+# It is imported, and the Environment built, on first use so `import parolo` stays cheap.
+_JENV = None
+_JINJA_OK: Optional[bool] = None  # None: not tried yet
+_JINJA_LOCK = threading.Lock()
+meta = None
+
+def _jinja():
+    """The shared Jinja2 Environment (None without Jinja2)."""
+    global _JENV, _JINJA_OK, meta
+    if _JINJA_OK is None:
+        with _JINJA_LOCK:
+            if _JINJA_OK is None:
+                try:
+                    from jinja2 import Environment, StrictUndefined, meta as jinja_meta
+                    _JENV = Environment(undefined=StrictUndefined, trim_blocks=True, lstrip_blocks=True,
+                                        loader=_StoreLoader())
+                    meta = jinja_meta
+                    _JINJA_OK = True
+                except Exception:
+                    _JINJA_OK = False
+    return _JENV
 
 # -------- helpers --------
 def set_base_dir(path: str | Path) -> None:
     global BASE_DIR
     BASE_DIR = Path(path).resolve()
+    _FILES.root = BASE_DIR
 
-def _dir(name: str) -> Path:          return BASE_DIR / name
-def _latest(name: str) -> Path:       return _dir(name) / "latest.txt"
-def _vdir(name: str) -> Path:         return _dir(name) / "versions"
-def _vfiles(name: str) -> List[Path]: return sorted(_vdir(name).glob("v*.txt"))
-
-def _atomic_write_text(path: Path, text: str) -> None:
+def _atomic_write_text(path: Path, text: str, *, fsync: bool = False) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     with tempfile.NamedTemporaryFile("w", delete=False, dir=path.parent, encoding="utf-8") as tf:
         tf.write(text)
+        if fsync:
+            tf.flush()
+            os.fsync(tf.fileno())
+        tmp = Path(tf.name)
+    os.replace(tmp, path)
+
+def _fsync_dir(path: Path) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:  # e.g. Windows: directories cannot be opened
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _atomic_write_bytes(path: Path, data: bytes, *, fsync: bool = False) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("wb", delete=False, dir=path.parent) as tf:
+        tf.write(data)
+        if fsync:
+            tf.flush()
+            os.fsync(tf.fileno())
         tmp = Path(tf.name)
     os.replace(tmp, path)
 
+def _read_text(path: Path) -> str:
+    with open(path, encoding="utf-8") as fh:
+        text = fh.read()
+        if _metrics.ENABLED:
+            _metrics.count("files_opened")
+            _metrics.count("bytes_read", os.fstat(fh.fileno()).st_size)
+    return text
+
+def _read_bytes(path: Path) -> bytes:
+    with open(path, "rb") as fh:
+        data = fh.read()
+    if _metrics.ENABLED:
+        _metrics.count("files_opened")
+        _metrics.count("bytes_read", len(data))
+    return data
+
+def _newlines(text: str) -> str:
+    """Universal newlines, as reading a text file in text mode gives."""
+    return text.replace("\r\n", "\n").replace("\r", "\n") if "\r" in text else text
+
+def _plain_text(data: bytes) -> str:
+    """Decode a stored text the way reading it in text mode would (universal newlines)."""
+    return _newlines(data.decode("utf-8"))
+
+def _loads(s: str) -> Any:
+    if _metrics.ENABLED:
+        _metrics.count("json_parses")
+    return json.loads(s)
+
 def _sha256(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
 def _now_iso() -> str:
     return datetime.now().isoformat()
 
-# -------- core I/O (compatible layout) --------
-def put(name: str, text: str, *, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+# -------- caches --------
+class _LRU:
     """
-    Save live prompt to latest.txt (atomically).
-    Write a new versions/vNNNN.txt + vNNNN.json only if content changed.
+    Small thread-safe LRU map with hit/miss/eviction counters. With maxbytes set,
+    the sizes passed to put() are summed and old entries evicted to stay under it.
     """
-    latest = _latest(name)
-    vdir = _vdir(name)
-    vdir.mkdir(parents=True, exist_ok=True)
-
-    existing = _vfiles(name)
-    last_hash = _sha256(existing[-1].read_text(encoding="utf-8")) if existing else None
-    cur_hash = _sha256(text)
-
-    _atomic_write_text(latest, text)
-
-    if not existing or cur_hash != last_hash:
-        next_n = (int(existing[-1].stem[1:]) + 1) if existing else 1
-        ver = f"v{next_n:04d}"
-        _atomic_write_text(vdir / f"{ver}.txt", text)
-
-        meta_obj = {
-            "version": ver,
-            "hash": cur_hash,
-            "timestamp": _now_iso(),
-            "size": len(text.encode("utf-8")),
-            "line_count": len(text.splitlines()),
-            "previous_hash": last_hash,
-            "metadata": metadata or {},
-        }
-        # best-effort: list Jinja variables to help debuggability
-        if _JINJA_OK:
+
+    def __init__(self, maxsize: int = 256, maxbytes: Optional[int] = None):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.bytes = 0
+        self._data: OrderedDict = OrderedDict()
+        self._sizes: Dict[Any, int] = {}
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
             try:
-                ast = _JENV.parse(text)
-                meta_obj["jinja_variables"] = sorted(list(meta.find_undeclared_variables(ast)))
-            except Exception:
-                pass
+                self._data.move_to_end(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return self._data[key]
+
+    def put(self, key, value, size: int = 0) -> None:
+        with self._lock:
+            self.bytes += size - self._sizes.pop(key, 0)
+            if size:
+                self._sizes[key] = size
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while self._data and (len(self._data) > self.maxsize or
+                                  (self.maxbytes is not None and self.bytes > self.maxbytes)):
+                k, _ = self._data.popitem(last=False)
+                self.bytes -= self._sizes.pop(k, 0)
+                self.evictions += 1
+
+    def pop(self, key, default=None):
+        with self._lock:
+            self.bytes -= self._sizes.pop(key, 0)
+            return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def discard(self, pred) -> None:
+        """Remove every entry whose key matches pred(key)."""
+        with self._lock:
+            for k in [k for k in self._data if pred(k)]:
+                del self._data[k]
+                self.bytes -= self._sizes.pop(k, 0)
+
+    def info(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "size": len(self._data), "maxsize": self.maxsize,
+                    "bytes": self.bytes, "maxbytes": self.maxbytes}
+
+# compiled templates: latest keyed by (base, name, stat stamp),
+# versions keyed by (base, name, version) since version files are immutable
+_TEMPLATES = _LRU(int(os.environ.get("PAROLO_TEMPLATE_CACHE", "256")))
 
-        _atomic_write_text(vdir / f"{ver}.json", json.dumps(meta_obj, indent=2))
-        return {"version": ver, "hash": cur_hash, "size": meta_obj["size"], "lines": meta_obj["line_count"]}
+def _stamp(st: os.stat_result) -> tuple:
+    # os.replace() gives every save a new inode, so this changes on each write
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+def template_cache_info() -> Dict[str, int]:
+    """Hit/miss/eviction counters of the compiled-template cache."""
+    return _TEMPLATES.info()
+
+def clear_template_cache(maxsize: Optional[int] = None) -> None:
+    """Drop all compiled templates (optionally resizing the cache)."""
+    if maxsize is not None:
+        _TEMPLATES.maxsize = maxsize
+    _TEMPLATES.clear()
+
+# Compiled template code is also kept on disk, keyed by the SHA-256 of the template text
+# plus the Jinja and Python versions (code objects are version specific):
+# <dir>/<h[:2]>/<h>.<tag>.code holds the marshalled (code object, undeclared variable
+# names, referenced templates), so other processes
+# skip parsing and code generation. Default dir: <root>/.jinja of the file store (other
+# backends need an explicit one); PAROLO_CODE_CACHE=0 turns it off, any other value is
+# the directory. Files can be deleted at any time.
+_CODE_ENV = os.environ.get("PAROLO_CODE_CACHE", "1")
+CODE_CACHE: bool | Path = _CODE_ENV not in ("", "0") and (_CODE_ENV == "1" or Path(_CODE_ENV))
+_CODE_TAG: Optional[str] = None
+
+def use_code_cache(path: bool | str | Path = True) -> None:
+    """Keep compiled templates on disk (True: in the file store's .jinja, a path, or False: off)."""
+    global CODE_CACHE
+    CODE_CACHE = path if isinstance(path, bool) else Path(path)
+
+def _code_path(text: str) -> Optional[Path]:
+    global _CODE_TAG
+    if CODE_CACHE is False:
+        return None
+    if _CODE_TAG is None:
+        import jinja2
+        _CODE_TAG = f"jinja{jinja2.__version__}-{sys.implementation.cache_tag}"
+    if CODE_CACHE is True:  # default location: only for the file store
+        if not isinstance(_BACKEND, FileBackend):
+            return None
+        root = _BACKEND.root / ".jinja"
     else:
-        return {"version": existing[-1].stem, "hash": cur_hash, "size": len(text.encode("utf-8")),
-                "lines": len(text.splitlines())}
+        root = CODE_CACHE
+    h = _sha256(text)
+    return root / h[:2] / f"{h}.{_CODE_TAG}.code"
+
+def _compile(text: str, *, globals: Optional[Mapping[str, Any]] = None, uptodate: Optional[Callable] = None):
+    """
+    Jinja Template for text: loaded from the on-disk code cache, else compiled (and stored).
+    Its parolo_variables are the undeclared variables of the text (the validation schema)
+    and parolo_dependencies the prompts it includes, extends or imports by constant name.
+    """
+    env = _jinja()
+    gs = env.make_globals(None) if globals is None else globals
+    path = _code_path(text)
+    if path is not None:
+        try:
+            code, names, deps = marshal.loads(_read_bytes(path))
+            tmpl = env.template_class.from_code(env, code, gs, uptodate)
+            if _metrics.ENABLED:
+                _metrics.count("template_code_loads")
+            tmpl.parolo_variables, tmpl.parolo_dependencies = frozenset(names), frozenset(deps)
+            return tmpl
+        except (OSError, ValueError, EOFError, TypeError):
+            pass
+    if _metrics.ENABLED:
+        _metrics.count("template_compiles")
+    ast = env.parse(text)  # parsed once for the schema, the dependencies and the code
+    names = sorted(meta.find_undeclared_variables(ast))
+    deps = sorted(r for r in meta.find_referenced_templates(ast) if r is not None)
+    code = env.compile(ast)
+    if path is not None:
+        try:
+            _atomic_write_bytes(path, marshal.dumps((code, names, deps)))
+        except OSError:  # read-only location: in-memory caching only
+            pass
+    tmpl = env.template_class.from_code(env, code, gs, uptodate)
+    tmpl.parolo_variables, tmpl.parolo_dependencies = frozenset(names), frozenset(deps)
+    return tmpl
+
+# -------- invalidation --------
+_INVALIDATE_HOOKS: List[Callable[[Optional[str]], None]] = []
+
+def on_invalidate(fn: Callable[[Optional[str]], None]) -> Callable[[Optional[str]], None]:
+    """Register fn(name) to be called when a prompt (None: all prompts) is invalidated."""
+    _INVALIDATE_HOOKS.append(fn)
+    return fn
+
+def invalidate(name: Optional[str] = None) -> None:
+    """Drop in-process cached state for one prompt, or for every prompt if name is None."""
+    _TEMPLATES.discard(lambda k: name is None or k[1] == name)
+    _INDEXES.discard(lambda k: name is None or k[1] == name)
+    _PACKS.discard(lambda k: name is None or k[1] == name)
+    _TEXTS.discard(lambda k: name is None or k[1] == name)
+    if _JENV is not None and _JENV.cache is not None:
+        _JENV.cache.clear()  # templates loaded for includes (cheap to reload)
+    for fn in _INVALIDATE_HOOKS:
+        fn(name)
+
+# -------- storage backends --------
+class Backend(abc.ABC):
+    """
+    Storage behind the prompts API. `key` identifies the store in the in-process
+    caches; token(name) changes on every new latest text and is 0 when missing.
+    Subclasses must implement put/get/get_version/entries/names/token (abstract);
+    the rest has generic defaults. Missing prompts and versions raise FileNotFoundError.
+    """
+    key: Any = None
+    read_only = False
+
+    @abc.abstractmethod
+    def put(self, name: str, text: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        ...
+
+    def put_many(self, groups: Dict[str, List[tuple]], *, fsync: bool = False) -> Dict[int, Dict[str, Any]]:
+        """groups = {name: [(input position, text, metadata)]} -> {input position: save info}."""
+        return {pos: self.put(name, text, md) for name, group in groups.items() for pos, text, md in group}
+
+    @abc.abstractmethod
+    def get(self, name: str) -> str:
+        ...
+
+    @abc.abstractmethod
+    def get_version(self, name: str, version: str) -> str:
+        ...
+
+    @abc.abstractmethod
+    def entries(self, name: str):
+        """(metadata objects oldest first, {vNNNN: metadata object})."""
+        ...
+
+    def meta(self, name: str, stem: str) -> Dict[str, Any]:
+        e = self.entries(name)[1].get(stem)
+        return _own(e) if e else {}
+
+    @abc.abstractmethod
+    def names(self) -> List[str]:
+        ...
+
+    @abc.abstractmethod
+    def token(self, name: str) -> int:
+        ...
+
+    def stamp(self, name: str) -> Hashable:
+        """Cheap validator of the latest text (compiled-template cache key)."""
+        return self.token(name)
+
+    def read_latest(self, name: str):
+        """(stamp, text) read consistently with each other."""
+        return self.stamp(name), self.get(name)
+
+    def generation(self) -> Optional[Hashable]:
+        """Store-wide value that changes on every write (None: not tracked)."""
+        return None
+
+    def changes_since(self, generation: Hashable):
+        """(current generation, {names written since}); None when unknown (re-check everything)."""
+        return None
+
+    def list_all(self, *, with_meta: bool = True) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        for name in self.names():
+            entries = self.entries(name)[0]
+            out.append(_listing(name, len(entries), self.token(name) != 0,
+                                entries[-1] if with_meta and entries else None))
+        return out
+
+def _stem(version: str) -> str:
+    return version[:-4] if version.endswith(".txt") else version
+
+def _next_version(head: Optional[Dict[str, Any]]) -> str:
+    return f"v{int(head['version'][1:]) + 1:04d}" if head else "v0001"
+
+def _save_info(version: str, hash_: str, text: str) -> Dict[str, Any]:
+    return {"version": version, "hash": hash_, "size": len(text.encode("utf-8")), "lines": len(text.splitlines())}
+
+def _version_meta(ver: str, text: str, cur_hash: str, last_hash: Optional[str],
+                  metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """The metadata object stored with every version."""
+    meta_obj = {
+        "version": ver,
+        "hash": cur_hash,
+        "timestamp": _now_iso(),
+        "size": len(text.encode("utf-8")),
+        "line_count": len(text.splitlines()),
+        "previous_hash": last_hash,
+        "metadata": metadata or {},
+    }
+    # best-effort: list Jinja variables to help debuggability
+    if _jinja() is not None:
+        try:
+            ast = _JENV.parse(text)
+            meta_obj["jinja_variables"] = sorted(list(meta.find_undeclared_variables(ast)))
+            refs = sorted(r for r in meta.find_referenced_templates(ast) if r is not None)
+            if refs:
+                meta_obj["jinja_includes"] = refs
+        except Exception:
+            pass
+    return meta_obj
+
+def _own(e: Dict[str, Any]) -> Dict[str, Any]:
+    """Caller-owned copy of a metadata object: entries() results are shared process-wide."""
+    out = {k: copy.deepcopy(v) if isinstance(v, (dict, list)) else v for k, v in e.items()}
+    out["metadata"] = out.get("metadata") or {}
+    return out
+
+def _listing(name: str, versions: int, has_latest: bool, last: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    info = {"name": name, "versions": versions, "has_latest": has_latest}
+    if last is not None:
+        info.update({
+            "latest_version": last["version"],
+            "hash": last.get("hash"),
+            "timestamp": last.get("timestamp"),
+            "size": last.get("size"),
+            "line_count": last.get("line_count"),
+        })
+    return info
+
+# -------- file store (compatible layout) --------
+# per-prompt write lock: versions/.lock serializes writers of one prompt across
+# processes (flock) and a per-prompt threading.Lock does the same inside a process.
+# Different prompts use different locks, so they never contend.
+_THREAD_LOCKS: "weakref.WeakValueDictionary[tuple, threading.Lock]" = weakref.WeakValueDictionary()
+_THREAD_LOCKS_GUARD = threading.Lock()
+
+_HELD = threading.local()  # keys locked by the current thread (the lock is reentrant)
+
+# Optional content-addressed blobs: texts live once under <root>/.blobs/<h[:2]>/<sha256>
+# and latest.txt / vNNNN.txt are hard links to them, so identical prompts share one
+# inode and readers (get, get_version, Prompt) need no changes. Falls back to plain
+# copies where links are unsupported (e.g. across devices).
+BLOBS = os.environ.get("PAROLO_BLOBS", "") not in ("", "0")
+
+def use_blobs(enabled: bool = True) -> None:
+    """Store new texts as hard links into the shared blob store."""
+    global BLOBS
+    BLOBS = enabled
+
+def _link_into(blob: Path, path: Path) -> None:
+    tmp = path.parent / f".{path.name}.{os.getpid()}.{threading.get_ident()}.lnk"
+    os.link(blob, tmp)
+    os.replace(tmp, path)
+
+# Store journal: every write appends the prompt name to <root>/.journal (one JSON
+# string per line). Its (inode, size) is a store-wide generation, so one stat tells a
+# reader whether anything changed and the tail since its last generation says what.
+JOURNAL = os.environ.get("PAROLO_JOURNAL", "1") not in ("", "0")
+
+def _journal_append(root: Path, names: Iterable[str]) -> None:
+    if not JOURNAL:
+        return
+    data = "".join(json.dumps(n) + "\n" for n in names).encode("utf-8")
+    fd = os.open(root / ".journal", os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, data)  # one O_APPEND write: lines of concurrent writers never interleave
+    finally:
+        os.close(fd)
+
+# Optional delta versions: vNNNN.txt may hold DELTA_MAGIC, a JSON header line naming the
+# base version and JSON line ops against it ([i, j]: copy base lines i..j, "s": insert s)
+# instead of the full text. Every DELTA_EVERY-th version (v0001, v0001+N, ...) is a full
+# checkpoint, so get_version() applies at most N-1 deltas; reconstructed texts are cached.
+# latest.txt is always full text, and hashes and sizes stay those of the full text.
+DELTA_EVERY = int(os.environ.get("PAROLO_DELTA_EVERY", "0"))
+DELTA_MAGIC = b"\0parolo-delta\n"
+
+_TEXTS = _LRU(int(os.environ.get("PAROLO_VERSION_CACHE", "256")),
+              maxbytes=int(os.environ.get("PAROLO_VERSION_CACHE_BYTES", str(64 << 20))))
+
+def use_deltas(every: int = 16) -> None:
+    """Store new versions as deltas, with a full checkpoint every `every` versions (0: off)."""
+    global DELTA_EVERY
+    if every < 0:
+        raise ValueError("every must be >= 0")
+    DELTA_EVERY = every
+
+def _line_delta(base: str, text: str) -> List[Any]:
+    from difflib import SequenceMatcher
+    a, b = base.splitlines(keepends=True), text.splitlines(keepends=True)
+    ops: List[Any] = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append("".join(b[j1:j2]))
+    return ops
+
+def _apply_delta(base: str, ops: List[Any]) -> str:
+    a = base.splitlines(keepends=True)
+    return "".join("".join(a[op[0]:op[1]]) if isinstance(op, list) else op for op in ops)
+
+# Optional compression of version files: from COMPRESS_MIN bytes up, vNNNN.txt holds a
+# codec magic header plus the compressed file content (full text or delta). Hashes and
+# sizes stay those of the plain text; latest.txt is never compressed.
+COMPRESS: Optional[str] = os.environ.get("PAROLO_COMPRESS") or None  # "zlib" | "zstd"
+COMPRESS_MIN = int(os.environ.get("PAROLO_COMPRESS_MIN", "4096"))
+_CODEC_MAGIC = {"zlib": b"\0parolo-zlib\n", "zstd": b"\0parolo-zstd\n"}
+
+def _codec(name: str):
+    """(compress, decompress) for a codec name; zstd needs Python 3.14+ or `zstandard`."""
+    if name == "zlib":
+        import zlib
+        return zlib.compress, zlib.decompress
+    if name == "zstd":
+        try:
+            from compression import zstd
+            return zstd.compress, zstd.decompress
+        except ImportError:
+            import zstandard
+            return zstandard.ZstdCompressor().compress, zstandard.ZstdDecompressor().decompress
+    raise ValueError(f"unknown compression codec {name!r}")
+
+def use_compression(codec: Optional[str] = "zlib", *, min_size: int = 4096) -> None:
+    """Compress new version files of at least min_size bytes (codec None: off)."""
+    global COMPRESS, COMPRESS_MIN
+    if codec is not None:
+        _codec(codec)  # unknown codec or missing module: fail here, not on save
+    COMPRESS, COMPRESS_MIN = codec, min_size
+
+def _compress(data: bytes) -> bytes:
+    if not COMPRESS or len(data) < COMPRESS_MIN:
+        return data
+    packed = _CODEC_MAGIC[COMPRESS] + _codec(COMPRESS)[0](data)
+    return packed if len(packed) < len(data) else data
+
+def version_cache_info() -> Dict[str, int]:
+    """Hit/miss/eviction counters of the reconstructed-version cache."""
+    return _TEXTS.info()
+
+# versions/index.jsonl holds one metadata object per version, appended by put(),
+# so listing and meta lookups read one file instead of every vNNNN.json
+_INDEXES = _LRU(int(os.environ.get("PAROLO_INDEX_CACHE", "1024")))
+
+# Cold versions can be moved into versions/pack.dat (append-only, raw texts back to back)
+# with versions/pack.idx = {vNNNN: {"offset", "length", "meta"}}. get_version() slices
+# them out of a per-process mmap; fresh versions stay loose files until packed.
+_PACKS = _LRU(int(os.environ.get("PAROLO_PACK_CACHE", "256")))
+
+class FileBackend(Backend):
+    """
+    <root>/<name>/latest.txt plus versions/vNNNN.txt + vNNNN.json, index.jsonl
+    and head.json (the default store, rooted at BASE_DIR).
+    """
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root).expanduser().resolve()
+
+    @property
+    def key(self) -> Path:
+        return self.root
+
+    def __repr__(self) -> str:
+        return f"FileBackend({str(self.root)!r})"
+
+    def _dir(self, name: str) -> Path:          return self.root / name
+    def _latest(self, name: str) -> Path:       return self._dir(name) / "latest.txt"
+    def _vdir(self, name: str) -> Path:         return self._dir(name) / "versions"
+    def _vfiles(self, name: str) -> List[Path]: return sorted(self._vdir(name).glob("v*.txt"))
+
+    # -------- write lock --------
+    @contextmanager
+    def _lock(self, name: str):
+        key = (self.root, name)
+        held = _HELD.__dict__.setdefault("keys", set())
+        if key in held:
+            yield
+            return
+        with _THREAD_LOCKS_GUARD:
+            tlock = _THREAD_LOCKS.get(key)
+            if tlock is None:
+                tlock = _THREAD_LOCKS[key] = threading.Lock()
+        with tlock:
+            path = self._vdir(name) / ".lock"
+            try:
+                fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            except FileNotFoundError:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                else:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                held.add(key)
+                yield
+            finally:
+                held.discard(key)
+                if fcntl is None:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+                os.close(fd)  # releases the flock
+
+    # -------- blobs --------
+    def _blob_path(self, hash_: str) -> Path:
+        return self.root / ".blobs" / hash_[:2] / hash_
+
+    def _store_blob(self, text: str, hash_: str) -> Path:
+        blob = self._blob_path(hash_)
+        if not blob.exists():
+            _atomic_write_text(blob, text)
+            os.chmod(blob, 0o444)  # blobs are shared: never written in place
+        return blob
+
+    def _write_text(self, path: Path, text: str, hash_: str, *, fsync: bool = False) -> None:
+        """Write a prompt text: a link into the blob store if enabled, else a plain file."""
+        if BLOBS:
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                _link_into(self._store_blob(text, hash_), path)
+                return
+            except OSError:
+                pass
+        _atomic_write_text(path, text, fsync=fsync)
+
+    def migrate_blobs(self) -> Dict[str, int]:
+        stats = {"files": 0, "linked": 0, "bytes_saved": 0}
+        for name in self.names():
+            with self._lock(name):  # a concurrent put must not be linked back to the old text
+                for p in [self._latest(name), *self._vfiles(name)]:
+                    self._migrate_file(p, stats)
+        return stats
+
+    def _migrate_file(self, p: Path, stats: Dict[str, int]) -> None:
+        if not p.exists():
+            return
+        stats["files"] += 1
+        data = p.read_bytes()
+        blob = self._blob_path(hashlib.sha256(data).hexdigest())
+        if not blob.exists():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.link(p, blob)  # the first copy becomes the blob
+                os.chmod(blob, 0o444)
+            except OSError:
+                pass
+        elif not os.path.samefile(blob, p):
+            try:
+                _link_into(blob, p)
+            except OSError:
+                return
+            stats["linked"] += 1
+            stats["bytes_saved"] += len(data)
+
+    def gc_blobs(self) -> int:
+        removed = 0
+        root = self.root / ".blobs"
+        if not root.exists():
+            return 0
+        for blob in root.glob("*/*"):
+            try:
+                if blob.stat().st_nlink == 1:
+                    blob.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    # -------- save --------
+    def put(self, name: str, text: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        cur_hash = _sha256(text)
+        head = self._peek_head(name)
+        if (head is not None and head.get("hash") == cur_hash
+                and head.get("latest") is not None and head["latest"] == self._latest_stamp(name)):
+            return _save_info(head["version"], cur_hash, text)
+
+        with self._lock(name):
+            head = self._head(name)  # another writer may have saved meanwhile
+            if head is not None and head["hash"] == cur_hash:
+                if not self._sync_latest(name, head, text):
+                    return _save_info(head["version"], cur_hash, text)
+                info = _save_info(head["version"], cur_hash, text)
+            else:
+                ver = _next_version(head)
+                base = self._delta_base(name, head)
+                self._write_text(self._latest(name), text, cur_hash)
+                meta_obj = self._write_version(name, ver, text, cur_hash, head["hash"] if head else None,
+                                               metadata, base=base)
+                self._append_index(name, meta_obj)
+                self._write_head(name, ver, cur_hash, latest=self._latest_stamp(name))
+                info = {"version": ver, "hash": cur_hash, "size": meta_obj["size"], "lines": meta_obj["line_count"]}
+        _journal_append(self.root, [name])
+        return info
+
+    def _write_version(self, name: str, ver: str, text: str, cur_hash: str, last_hash: Optional[str],
+                       metadata: Optional[Dict[str, Any]], *, fsync: bool = False,
+                       base: Optional[tuple] = None) -> Dict[str, Any]:
+        """Write versions/vNNNN.txt + vNNNN.json and return the metadata object."""
+        vdir = self._vdir(name)
+        delta = self._encode_delta(ver, text, base)
+        data = _compress(delta if delta is not None else text.encode("utf-8")) if COMPRESS else delta
+        if data is None or data[:1] != b"\0":  # plain full text
+            self._write_text(vdir / f"{ver}.txt", text, cur_hash, fsync=fsync)
+        else:
+            _atomic_write_bytes(vdir / f"{ver}.txt", data, fsync=fsync)
+        if delta is not None:
+            read_back = _newlines(text)  # what get_version() returns; the next save deltas against it
+            _TEXTS.put((self.root, name, ver), read_back, len(read_back))
+        meta_obj = _version_meta(ver, text, cur_hash, last_hash, metadata)
+        _atomic_write_text(vdir / f"{ver}.json", json.dumps(meta_obj, indent=2), fsync=fsync)
+        return meta_obj
+
+    def put_many(self, groups: Dict[str, List[tuple]], *, fsync: bool = False) -> Dict[int, Dict[str, Any]]:
+        results: Dict[int, Dict[str, Any]] = {}
+        for name, group in groups.items():
+            with self._lock(name):
+                results.update(self._save_group(name, group, fsync))
+        return results
+
+    def _save_group(self, name: str, group: List[tuple], fsync: bool) -> Dict[int, Dict[str, Any]]:
+        """save_many() for one prompt, under its write lock: {input position: info}."""
+        results: Dict[int, Dict[str, Any]] = {}
+        head = self._head(name)
+        plan, last = [], head
+        for pos, text, md in group:
+            h = _sha256(text)
+            if last is not None and last["hash"] == h:
+                plan.append((pos, text, md, h, None, last))
+                continue
+            ver = _next_version(last)
+            plan.append((pos, text, md, h, ver, last))
+            last = {"version": ver, "hash": h}
+        if last is head:  # nothing changed for this prompt
+            if head is not None and self._sync_latest(name, head, group[-1][1]):
+                _journal_append(self.root, [name])
+            return {pos: _save_info(cur["version"], h, text) for pos, text, _, h, _, cur in plan}
 
+        # latest.txt first, so an interrupted batch is redone by the next save
+        base = self._delta_base(name, head)
+        self._write_text(self._latest(name), group[-1][1], last["hash"], fsync=fsync)
+        metas = []
+        for pos, text, md, h, ver, prev in plan:
+            if ver is None:
+                results[pos] = _save_info(prev["version"], h, text)
+                continue
+            m = self._write_version(name, ver, text, h, prev["hash"] if prev else None, md, fsync=fsync,
+                                    base=base)
+            base = (ver, text)
+            metas.append(m)
+            results[pos] = {"version": ver, "hash": h, "size": m["size"], "lines": m["line_count"]}
+        self._append_index(name, *metas, fsync=fsync)
+        self._write_head(name, last["version"], last["hash"], fsync=fsync, latest=self._latest_stamp(name))
+        if fsync:
+            _fsync_dir(self._vdir(name))
+            _fsync_dir(self._dir(name))
+        _journal_append(self.root, [name])
+        return results
+
+    # -------- read --------
+    def get(self, name: str) -> str:
+        return _read_text(self._latest(name))
+
+    def get_version(self, name: str, version: str) -> str:
+        stem = _stem(version)
+        data = self._packed_bytes(name, stem)  # already-mapped pack: no syscalls
+        if data is None:
+            try:
+                data = _read_bytes(self._vdir(name) / f"{stem}.txt")
+            except FileNotFoundError:
+                data = self._packed_bytes(name, stem, refresh=True)
+        if data is None:
+            raise FileNotFoundError(f"{name} {version} not found")
+        return self._decode(name, stem, data)
+
+    def _read_meta_file(self, name: str, stem: str) -> Dict[str, Any]:
+        p = self._vdir(name) / f"{stem}.json"
+        if not p.exists():
+            return {}
+        try:
+            return _loads(_read_text(p))
+        except json.JSONDecodeError:
+            return {}
+
+    def meta(self, name: str, stem: str) -> Dict[str, Any]:
+        return super().meta(name, stem) or self._read_meta_file(name, stem)
+
+    def names(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return [e.name for e in sorted(self.root.iterdir()) if e.is_dir() and not e.name.startswith(".")]
+
+    def token(self, name: str) -> int:
+        try:
+            return self._latest(name).stat().st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def stamp(self, name: str) -> tuple:
+        return _stamp(self._latest(name).stat())
+
+    # -------- journal --------
+    def generation(self) -> Optional[tuple]:
+        if not JOURNAL:
+            return None
+        try:
+            st = os.stat(self.root / ".journal")
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_size)
+
+    def changes_since(self, generation: Optional[tuple]):
+        if not JOURNAL or generation is None:
+            return None
+        try:
+            fh = open(self.root / ".journal", "rb")
+        except FileNotFoundError:
+            return None
+        with fh:
+            st = os.fstat(fh.fileno())
+            if st.st_ino != generation[0] or st.st_size < generation[1]:
+                return None  # compacted: everything may have changed
+            fh.seek(generation[1])
+            data = fh.read()
+        end = data.rfind(b"\n") + 1  # a torn last line is read next time
+        try:
+            names = {json.loads(line) for line in data[:end].splitlines() if line}
+        except ValueError:
+            return None
+        return (generation[0], generation[1] + end), names
+
+    def compact_journal(self) -> None:
+        """Empty the journal (readers see a new inode and re-check everything once)."""
+        _atomic_write_text(self.root / ".journal", "")
+
+    def read_latest(self, name: str):
+        # read and stamp through the same fd so a cached entry matches its content
+        with open(self._latest(name), encoding="utf-8") as fh:
+            st = os.fstat(fh.fileno())
+            if _metrics.ENABLED:
+                _metrics.count("files_opened")
+                _metrics.count("bytes_read", st.st_size)
+            return _stamp(st), fh.read()
+
+    # -------- delta versions --------
+    def _delta_base(self, name: str, head: Optional[Dict[str, Any]]) -> Optional[tuple]:
+        """(version, text) of the current head to delta the next version against."""
+        if not DELTA_EVERY or head is None:
+            return None
+        try:
+            return head["version"], self.get_version(name, head["version"])
+        except FileNotFoundError:
+            return None
+
+    def _encode_delta(self, ver: str, text: str, base: Optional[tuple]) -> Optional[bytes]:
+        """
+        The delta file for ver, or None to store the full text (checkpoint, or no gain).
+        Deltas are taken between the texts as read back (universal newlines).
+        """
+        if not DELTA_EVERY or base is None or (int(ver[1:]) - 1) % DELTA_EVERY == 0:
+            return None
+        if int(base[0][1:]) != int(ver[1:]) - 1:
+            return None
+        data = (DELTA_MAGIC + json.dumps({"base": base[0]}).encode("utf-8") + b"\n"
+                + json.dumps(_line_delta(_newlines(base[1]), _newlines(text)), separators=(",", ":")).encode("utf-8"))
+        return data if len(data) < len(text.encode("utf-8")) * 3 // 4 else None
+
+    def _decode(self, name: str, stem: str, data: bytes) -> str:
+        """The full text of a stored version file (plain, compressed, or a delta on its base)."""
+        if data[:1] != b"\0":  # plain text
+            return _plain_text(data)
+        for codec, magic in _CODEC_MAGIC.items():
+            if data.startswith(magic):
+                return self._decode(name, stem, _codec(codec)[1](data[len(magic):]))
+        if not data.startswith(DELTA_MAGIC):
+            return _plain_text(data)
+        key = (self.root, name, stem)
+        text = _TEXTS.get(key)
+        if text is None:
+            end = data.index(b"\n", len(DELTA_MAGIC))
+            header = _loads(data[len(DELTA_MAGIC):end])
+            text = _newlines(_apply_delta(self.get_version(name, header["base"]), _loads(data[end + 1:])))
+            _TEXTS.put(key, text, len(text))
+        return text
+
+    # -------- version index --------
+    def _index_path(self, name: str) -> Path:  return self._vdir(name) / "index.jsonl"
+
+    def _append_index(self, name: str, *meta_objs: Dict[str, Any], fsync: bool = False) -> None:
+        p = self._index_path(name)
+        if not p.exists():
+            self.rebuild_index(name)  # legacy store: recover history (including these versions)
+            return
+        with open(p, "a", encoding="utf-8") as fh:
+            fh.write("".join(json.dumps(m, separators=(",", ":")) + "\n" for m in meta_objs))
+            if fsync:
+                fh.flush()
+                os.fsync(fh.fileno())
+
+    def _scan_entries(self, name: str) -> List[Dict[str, Any]]:
+        """Index entries recovered from the loose vNNNN.json files and the pack index."""
+        packed = self._read_pack_index(name)
+        stems = sorted({p.stem for p in self._vfiles(name)} | set(packed))
+        return [self._read_meta_file(name, s) or packed.get(s, {}).get("meta") or {"version": s}
+                for s in stems]
+
+    def rebuild_index(self, name: str) -> int:
+        entries = self._scan_entries(name)
+        _atomic_write_text(self._index_path(name),
+                           "".join(json.dumps(e, separators=(",", ":")) + "\n" for e in entries))
+        _INDEXES.pop((self.root, name))
+        return len(entries)
+
+    def _load_index(self, name: str, p: Path, st: os.stat_result):
+        key = (self.root, name)
+        cached = _INDEXES.get(key)
+        if cached is not None and cached[0] == _stamp(st):
+            return cached[1], cached[2]
+        entries = []
+        with open(p, encoding="utf-8") as fh:
+            st = os.fstat(fh.fileno())
+            for line in fh:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:  # torn trailing line from an interrupted append
+                    continue
+        if _metrics.ENABLED:
+            _metrics.count("files_opened")
+            _metrics.count("bytes_read", st.st_size)
+            _metrics.count("json_parses", len(entries))
+        by_version = {e["version"]: e for e in entries}
+        _INDEXES.put(key, (_stamp(st), entries, by_version))
+        return entries, by_version
+
+    def _behind(self, name: str, entries: List[Dict[str, Any]]) -> bool:
+        last = int(entries[-1]["version"][1:]) if entries else 0
+        return (self._vdir(name) / f"v{last + 1:04d}.txt").exists()
+
+    def entries(self, name: str):
+        """(entries, by_version) for a prompt, parsed once per index file change."""
+        p = self._index_path(name)
+        try:
+            entries, by_version = self._load_index(name, p, p.stat())
+            if not self._behind(name, entries):
+                return entries, by_version
+        except FileNotFoundError:
+            if not self._vdir(name).exists():
+                return [], {}
+        # missing, or behind the version files (older writers, interrupted or in-flight
+        # saves): re-check under the write lock so a writer's pending append is never lost
+        try:
+            with self._lock(name):
+                try:
+                    entries, by_version = self._load_index(name, p, p.stat())
+                    if not self._behind(name, entries):
+                        return entries, by_version
+                except FileNotFoundError:
+                    pass
+                self.rebuild_index(name)
+                return self._load_index(name, p, p.stat())
+        except OSError:  # read-only store: serve from the json files
+            entries = self._scan_entries(name)
+            return entries, {e["version"]: e for e in entries}
+
+    # -------- head record --------
+    # versions/head.json caches {"version", "hash", "latest"} of the newest version for put();
+    # "latest" is the stamp of latest.txt when it was written, so an unchanged save also
+    # notices (with one stat) a latest.txt that was deleted, edited or left by a torn save
+    def _head_path(self, name: str) -> Path:   return self._vdir(name) / "head.json"
+
+    def _latest_stamp(self, name: str) -> Optional[list]:
+        try:
+            return list(_stamp(self._latest(name).stat()))
+        except FileNotFoundError:
+            return None
+
+    def _sync_latest(self, name: str, head: Dict[str, Any], text: str) -> bool:
+        """
+        Unchanged save: make sure latest.txt still holds the head text (text) and record
+        its stamp. Returns True if latest.txt had to be rewritten. Call with the lock held.
+        """
+        stamp = self._latest_stamp(name)
+        if stamp is not None and stamp == head.get("latest"):
+            return False
+        try:
+            intact = hashlib.sha256(_read_bytes(self._latest(name))).hexdigest() == head["hash"]
+        except FileNotFoundError:
+            intact = False
+        if not intact:
+            self._write_text(self._latest(name), text, head["hash"])
+        try:
+            self._write_head(name, head["version"], head["hash"], latest=self._latest_stamp(name))
+        except OSError:
+            pass
+        return not intact
+
+    def _peek_head(self, name: str) -> Optional[Dict[str, Any]]:
+        """head.json as stored (no staleness check); for the lock-free unchanged-save test."""
+        try:
+            return _loads(_read_text(self._head_path(name)))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write_head(self, name: str, version: str, hash_: str, *, fsync: bool = False,
+                    latest: Optional[list] = None) -> None:
+        head = {"version": version, "hash": hash_}
+        if latest is not None:
+            head["latest"] = latest
+        _atomic_write_text(self._head_path(name), json.dumps(head), fsync=fsync)
+
+    def _head(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Newest {"version", "hash"}; falls back to the index when head.json is missing or
+        stale. Call with the write lock held.
+        """
+        try:
+            head = _loads(_read_text(self._head_path(name)))
+            n = int(head["version"][1:])
+            if head.get("hash") and not (self._vdir(name) / f"v{n + 1:04d}.txt").exists():
+                return head
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, ValueError):
+            pass
+        entries = self.entries(name)[0]
+        if not entries:
+            return None
+        ver = entries[-1]["version"]
+        hash_ = entries[-1].get("hash") or _sha256(self.get_version(name, ver))
+        try:
+            self._write_head(name, ver, hash_)
+        except OSError:
+            pass
+        return {"version": ver, "hash": hash_}
+
+    # -------- packs --------
+    def _pack_paths(self, name: str):
+        return self._vdir(name) / "pack.dat", self._vdir(name) / "pack.idx"
+
+    def _read_pack_index(self, name: str) -> Dict[str, Any]:
+        try:
+            return _loads(_read_text(self._pack_paths(name)[1]))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _packed_bytes(self, name: str, stem: str, *, refresh: bool = False) -> Optional[bytes]:
+        key = (self.root, name)
+        entry = _PACKS.get(key)
+        if refresh and (entry is None or stem not in entry[0]):
+            idx = self._read_pack_index(name)
+            if stem not in idx:
+                return None
+            with open(self._pack_paths(name)[0], "rb") as fh:
+                entry = (idx, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ))
+            _PACKS.put(key, entry)
+        if entry is None or stem not in entry[0]:
+            return None
+        e = entry[0][stem]
+        return entry[1][e["offset"]:e["offset"] + e["length"]]
+
+    def pack(self, name: str, *, keep: int = 10) -> int:
+        if not self._vdir(name).exists():
+            return 0
+        with self._lock(name):
+            return self._pack_locked(name, keep)
+
+    def _pack_locked(self, name: str, keep: int) -> int:
+        entries, by_version = self.entries(name)
+        cold = [e["version"] for e in (entries[:-keep] if keep > 0 else entries)]
+        if not cold:
+            return 0
+        vdir = self._vdir(name)
+        dat, idx_path = self._pack_paths(name)
+        idx = self._read_pack_index(name)
+        added = 0
+        with open(dat, "ab") as fh:
+            offset = fh.seek(0, os.SEEK_END)
+            for v in cold:
+                if v in idx:
+                    continue
+                try:
+                    data = (vdir / f"{v}.txt").read_bytes()
+                except FileNotFoundError:
+                    continue
+                fh.write(data)
+                idx[v] = {"offset": offset, "length": len(data), "meta": by_version[v]}
+                offset += len(data)
+                added += 1
+            fh.flush()
+            os.fsync(fh.fileno())
+        _atomic_write_text(idx_path, json.dumps(idx, separators=(",", ":")), fsync=True)
+        _PACKS.pop((self.root, name))
+        # loose copies go only after the pack index is durable
+        for v in cold:
+            if v in idx:
+                (vdir / f"{v}.txt").unlink(missing_ok=True)
+                (vdir / f"{v}.json").unlink(missing_ok=True)
+        return added
+
+# -------- active backend --------
+_FILES = FileBackend(BASE_DIR)
+_BACKEND: Backend = _FILES
+
+def use_backend(backend: Optional[Backend] = None) -> Backend:
+    """Serve the prompts/tenants API from backend (None: the file store at BASE_DIR)."""
+    global _BACKEND
+    _BACKEND = backend if backend is not None else _FILES
+    invalidate()
+    return _BACKEND
+
+def get_backend() -> Backend:
+    return _BACKEND
+
+def _files(op: str) -> FileBackend:
+    """The active backend, for operations that only exist on the file layout."""
+    if isinstance(_BACKEND, FileBackend):
+        return _BACKEND
+    if _BACKEND.read_only:
+        raise PermissionError(f"cannot {op}: {_BACKEND!r} is read-only")
+    raise io.UnsupportedOperation(f"{op} needs the file store, not {type(_BACKEND).__name__}")
+
+# -------- core I/O --------
+@_metrics.timed("save")
+def put(name: str, text: str, *, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Save live prompt to latest.txt (atomically).
+    Write a new versions/vNNNN.txt + vNNNN.json only if content changed.
+    The last hash and version number come from versions/head.json, so an unchanged
+    save costs one small read and one hash, and older versions are never touched.
+    Version numbers are allocated under a per-prompt lock, safe for many writers.
+    """
+    return _BACKEND.put(name, text, metadata)
+
+@_metrics.timed("read")
 def get(name: str) -> str:
-    return _latest(name).read_text(encoding="utf-8")
+    return _BACKEND.get(name)
 
+@_metrics.timed("read_version")
 def get_version(name: str, version: str) -> str:
-    vname = version if version.endswith(".txt") else f"{version}.txt"
-    p = _vdir(name) / vname
-    if not p.exists():
-        raise FileNotFoundError(f"{name} {version} not found")
-    return p.read_text(encoding="utf-8")
+    return _BACKEND.get_version(name, version)
 
+@_metrics.timed("meta")
 def meta_version(name: str, version: str) -> Dict[str, Any]:
-    stem = version[:-4] if version.endswith(".txt") else version
-    p = _vdir(name) / f"{stem}.json"
-    if not p.exists():
-        return {}
-    try:
-        return json.loads(p.read_text(encoding="utf-8"))
-    except json.JSONDecodeError:
-        return {}
+    return _BACKEND.meta(name, _stem(version))
+
+def rebuild_index(name: str) -> int:
+    """Recreate versions/index.jsonl from the vNNNN.json files (and pack); returns the entry count."""
+    return _files("rebuild the index").rebuild_index(name)
+
+def migrate_blobs() -> Dict[str, int]:
+    """Convert every latest.txt / vNNNN.txt in the store into blob links (idempotent)."""
+    return _files("migrate blobs").migrate_blobs()
+
+def gc_blobs() -> int:
+    """Remove blobs no prompt links to any more; returns the number removed."""
+    return _files("collect blobs").gc_blobs()
+
+def pack(name: str, *, keep: int = 10) -> int:
+    """Move all but the newest `keep` versions into the pack; returns how many were added."""
+    return _files(f"pack {name!r}").pack(name, keep=keep)
+
+def pack_all(*, keep: int = 10) -> Dict[str, int]:
+    """pack() every prompt; returns {name: versions added}."""
+    files = _files("pack")
+    return {name: files.pack(name, keep=keep) for name in files.names()}
 
 # -------- listing --------
+@_metrics.timed("versions")
 def list_versions(name: str, *, with_meta: bool = False):
-    files = _vfiles(name)
+    entries = _BACKEND.entries(name)[0]
     if not with_meta:
-        return [p.name for p in files]
-    out = []
-    for p in files:
-        m = meta_version(name, p.stem)
-        out.append({
-            "file": p.name,
-            "version": p.stem,
-            "timestamp": m.get("timestamp"),
-            "hash": m.get("hash"),
-            "size": m.get("size"),
-            "line_count": m.get("line_count"),
-            "jinja_variables": m.get("jinja_variables"),
-        })
-    return out
+        return [f"{e['version']}.txt" for e in entries]
+    return [{
+        "file": f"{e['version']}.txt",
+        "version": e["version"],
+        "timestamp": e.get("timestamp"),
+        "hash": e.get("hash"),
+        "size": e.get("size"),
+        "line_count": e.get("line_count"),
+        "jinja_variables": e.get("jinja_variables"),
+        "metadata": e["metadata"],
+    } for e in map(_own, entries)]
 
+@_metrics.timed("list")
 def list_all(*, with_meta: bool = True) -> List[Dict[str, Any]]:
-    if not BASE_DIR.exists():
-        return []
-    out: List[Dict[str, Any]] = []
-    for entry in sorted(BASE_DIR.iterdir()):
-        if not entry.is_dir():
-            continue
-        name = entry.name
-        latest = entry / "latest.txt"
-        vfiles = _vfiles(name)
-        info = {"name": name, "versions": len(vfiles), "has_latest": latest.exists()}
-        if with_meta and vfiles:
-            m = meta_version(name, vfiles[-1].stem)
-            info.update({
-                "latest_version": vfiles[-1].stem,
-                "hash": m.get("hash"),
-                "timestamp": m.get("timestamp"),
-                "size": m.get("size"),
-                "line_count": m.get("line_count"),
-            })
-        out.append(info)
-    return out
+    return _BACKEND.list_all(with_meta=with_meta)
 
 # -------- hot-reload token --------
+@_metrics.timed("token")
 def token(name: str) -> int:
-    try:
-        return _latest(name).stat().st_mtime_ns
-    except FileNotFoundError:
-        return 0
+    return _BACKEND.token(name)
+
+def generation() -> Optional[Hashable]:
+    """Store-wide generation: changes whenever any prompt is saved (None: not tracked)."""
+    return _BACKEND.generation()
+
+def changes_since(gen: Hashable):
+    """(current generation, {names saved since gen}), or None: treat everything as changed."""
+    return _BACKEND.changes_since(gen)
+
+def compact_journal() -> None:
+    """Truncate the store journal; run when it has grown large."""
+    _files("compact the journal").compact_journal()
+
+# -------- store loader (composition) --------
+# {% include %}, {% extends %} and {% import %} resolve stored prompts: "name" is the
+# latest text, "name@v0003" a pinned version. Jinja caches loaded templates and asks
+# uptodate() before each reuse: one stamp check (a stat on the file store) per latest
+# dependency, none for pinned ones. A cached composite therefore stays compiled and
+# only the dependency that changed is reloaded.
+# Composition is off by default, since a template could otherwise read any prompt in the
+# store: use_composition() or PAROLO_COMPOSE=1 turn it on, optionally limited to names
+# with given prefixes (e.g. one tenant's) or a predicate. Refs with path separators,
+# ".." or a leading "." are always rejected.
+COMPOSE: bool | tuple | Callable[[str], bool] = os.environ.get("PAROLO_COMPOSE", "") not in ("", "0")
+
+def use_composition(enabled: bool = True, *, allow: Optional[Iterable[str] | Callable[[str], bool]] = None) -> None:
+    """Let templates include/extend/import stored prompts (allow: name prefixes or a predicate)."""
+    global COMPOSE
+    if not enabled:
+        COMPOSE = False
+    elif allow is None:
+        COMPOSE = True
+    else:
+        COMPOSE = allow if callable(allow) else tuple(allow)
+    if _JENV is not None:
+        _JENV.cache.clear()  # loaded dependencies were resolved under the old rule
+
+def _composable(name: str) -> bool:
+    if COMPOSE is False or not name or name[0] == "." or "/" in name or "\\" in name or ".." in name:
+        return False
+    if COMPOSE is True:
+        return True
+    return name.startswith(COMPOSE) if isinstance(COMPOSE, tuple) else bool(COMPOSE(name))
+
+def _split_ref(ref: str) -> tuple:
+    """'name@v0003' -> ('name', 'v0003'); 'name' -> ('name', None)."""
+    name, sep, version = ref.rpartition("@")
+    if sep and version[:1] == "v" and _stem(version)[1:].isdigit():
+        return name, _stem(version)
+    return ref, None
+
+class _StoreLoader:
+    """Jinja loader over the active backend (see above)."""
+
+    def get_source(self, environment, template: str):
+        name, version = _split_ref(template)
+        if not _composable(name):
+            from jinja2 import TemplateNotFound
+            raise TemplateNotFound(template, "composition is off (see use_composition)" if COMPOSE is False
+                                   else f"{template!r} may not be included here")
+        b = _BACKEND
+        try:
+            if version is not None:  # versions never change
+                return b.get_version(name, version), None, lambda: b is _BACKEND
+            stamp, text = b.read_latest(name)
+        except FileNotFoundError:
+            from jinja2 import TemplateNotFound
+            raise TemplateNotFound(template) from None
+
+        def uptodate() -> bool:
+            try:
+                return b is _BACKEND and b.stamp(name) == stamp
+            except FileNotFoundError:
+                return False
+        return text, None, uptodate
+
+    def load(self, environment, name: str, globals=None):
+        text, _, uptodate = self.get_source(environment, name)
+        return _compile(text, globals=globals, uptodate=uptodate)
+
+    def list_templates(self) -> List[str]:
+        return _BACKEND.names()
+
+def _closure(tmpl, seen: set) -> None:
+    """Add the transitive dependencies of tmpl to seen."""
+    for ref in tmpl.parolo_dependencies:
+        if ref not in seen:
+            seen.add(ref)
+            _closure(_JENV.get_template(ref), seen)
+
+def dependencies(prompt_id: str, *, version: Optional[str] = None) -> List[str]:
+    """Prompts the current text (or version) includes, extends or imports, transitively."""
+    seen: set = set()
+    _closure(template(prompt_id) if version is None else template_version(prompt_id, version), seen)
+    return sorted(seen)
+
+def _variables(tmpl) -> frozenset:
+    """Variables a render of tmpl needs, including those of its dependencies."""
+    if not tmpl.parolo_dependencies:
+        return tmpl.parolo_variables
+    seen: set = set()
+    _closure(tmpl, seen)
+    return tmpl.parolo_variables.union(*(_JENV.get_template(ref).parolo_variables for ref in seen))
 
 # -------- Jinja2 rendering (function API only) --------
+@_metrics.timed("template")
 def template(prompt_id: str):
-    """Compile current prompt as a Jinja2 template (StrictUndefined)."""
-    return _JENV.from_string(get(prompt_id))
+    """Compile current prompt as a Jinja2 template (StrictUndefined), cached per content."""
+    b = _BACKEND
+    tmpl = _TEMPLATES.get((b.key, prompt_id, b.stamp(prompt_id)))
+    if tmpl is not None:
+        return tmpl
+    stamp, text = b.read_latest(prompt_id)
+    tmpl = _compile(text)
+    _TEMPLATES.put((b.key, prompt_id, stamp), tmpl)
+    return tmpl
+
+class MissingVariablesError(KeyError):
+    """The context lacks variables the template uses (raised before rendering starts)."""
+
+    def __init__(self, name: str, missing: Iterable[str], row: Optional[int] = None):
+        self.name, self.missing, self.row = name, sorted(missing), row
+        where = "" if row is None else f" (context #{row})"
+        super().__init__(f"{name!r} is missing variables: {', '.join(self.missing)}{where}")
+
+    def __str__(self) -> str:
+        return self.args[0]
+
+def _check(prompt_id: str, tmpl, context: Mapping[str, Any], row: Optional[int] = None) -> None:
+    missing = [v for v in _variables(tmpl) if v not in context]
+    if missing:
+        raise MissingVariablesError(prompt_id, missing, row)
+
+@_metrics.timed("validate")
+def validate(prompt_id: str, context: Mapping[str, Any], *, version: Optional[str] = None) -> None:
+    """
+    Raise MissingVariablesError unless context has every variable the prompt (or version)
+    references. Checks the cached schema of the compiled template: no parsing.
+    """
+    _check(prompt_id, template(prompt_id) if version is None else template_version(prompt_id, version), context)
 
+@_metrics.timed("render")
 def render(prompt_id: str, **context) -> str:
     """Render current prompt with Jinja2 (StrictUndefined)."""
     return template(prompt_id).render(**context)
 
+@_metrics.timed("render_checked")
+def render_checked(prompt_id: str, context: Mapping[str, Any], *, version: Optional[str] = None) -> str:
+    """
+    validate() then render the prompt (or version). The context is a mapping, so any
+    variable name can be used, including ones that are keyword options elsewhere.
+    """
+    tmpl = template(prompt_id) if version is None else template_version(prompt_id, version)
+    _check(prompt_id, tmpl, context)
+    return tmpl.render(context)
+
+def template_version(prompt_id: str, version: str):
+    """Compile a stored version; cached by (name, version) as versions are immutable."""
+    stem = _stem(version)
+    key = (_BACKEND.key, prompt_id, stem)
+    tmpl = _TEMPLATES.get(key)
+    if tmpl is None:
+        tmpl = _compile(get_version(prompt_id, stem))
+        _TEMPLATES.put(key, tmpl)
+    return tmpl
+
+@_metrics.timed("render_version")
 def render_version(prompt_id: str, version: str, **context) -> str:
-    return _JENV.from_string(get_version(prompt_id, version)).render(**context)
+    return template_version(prompt_id, version).render(**context)
+
+# -------- streaming render --------
+# Template.generate() yields output piece by piece; pieces are joined into chunks of
+# about chunk_size characters, so peak memory follows the chunk, not the whole output.
+# Undefined variables raise mid-stream, after earlier chunks were produced (call
+# validate() first to fail early). chunk_size (and version, encoding for render_to) are
+# options, not template variables.
+STREAM_CHUNK = int(os.environ.get("PAROLO_STREAM_CHUNK", str(64 * 1024)))
 
+def _chunks(pieces: Iterable[str], chunk_size: int) -> Iterator[str]:
+    buf: List[str] = []
+    n = 0
+    for piece in pieces:
+        buf.append(piece)
+        n += len(piece)
+        if n >= chunk_size:
+            yield "".join(buf)
+            buf, n = [], 0
+    if buf:
+        yield "".join(buf)
+
+def render_stream(prompt_id: str, *, chunk_size: int = STREAM_CHUNK, **context) -> Iterator[str]:
+    """Render current prompt as an iterator of text chunks."""
+    return _chunks(template(prompt_id).generate(**context), chunk_size)
+
+def render_version_stream(prompt_id: str, version: str, *, chunk_size: int = STREAM_CHUNK,
+                          **context) -> Iterator[str]:
+    """Render a stored version as an iterator of text chunks."""
+    return _chunks(template_version(prompt_id, version).generate(**context), chunk_size)
+
+@_metrics.timed("render_to")
+def render_to(prompt_id: str, out, *, version: Optional[str] = None, chunk_size: int = STREAM_CHUNK,
+              encoding: str = "utf-8", **context) -> int:
+    """
+    Stream a rendering into out: text files get str chunks, binary files and sockets
+    (sendall) encoded bytes. Returns the number of characters or bytes written.
+    """
+    tmpl = template(prompt_id) if version is None else template_version(prompt_id, version)
+    send = getattr(out, "sendall", None)
+    text_mode = send is None and isinstance(out, io.TextIOBase)
+    write = send or out.write
+    n = 0
+    for chunk in _chunks(tmpl.generate(**context), chunk_size):
+        data = chunk if text_mode else chunk.encode(encoding)
+        write(data)
+        n += len(data)
+    return n
+
+def precompile(names: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """
+    Write the compiled code of every latest prompt (or of `names`) to the on-disk cache,
+    e.g. at deploy time. Returns {"compiled", "cached", "errors"} counts.
+    """
+    if _jinja() is None or _code_path("") is None:
+        raise RuntimeError("precompile needs Jinja2 and a code cache directory (use_code_cache)")
+    stats = {"compiled": 0, "cached": 0, "errors": 0}
+    for name in (_BACKEND.names() if names is None else names):
+        try:
+            text = _BACKEND.get(name)
+            path = _code_path(text)
+            if path.exists():
+                stats["cached"] += 1
+                continue
+            _compile(text)
+            stats["compiled"] += 1
+        except Exception:  # missing prompt or template syntax error
+            stats["errors"] += 1
+    return stats
+
+@_metrics.timed("vars")
 def jinja_variables(name: str) -> List[str]:
-    if not _JINJA_OK:
+    if _jinja() is None:
         return []
     try:
-        ast = _JENV.parse(get(name))
-        return sorted(list(meta.find_undeclared_variables(ast)))
+        return sorted(_variables(template(name)))
     except Exception:
         return []
+
+# -------- bulk API --------
+@_metrics.timed("read_many")
+def read_many(names: Iterable[str], *, workers: Optional[int] = None,
+              skip_missing: bool = False) -> Dict[str, str]:
+    """Read several prompts with parallel I/O; returns {name: text} in input order."""
+    from concurrent.futures import ThreadPoolExecutor
+    names = list(dict.fromkeys(names))
+    def one(n: str) -> Optional[str]:
+        try:
+            return get(n)
+        except FileNotFoundError:
+            if skip_missing:
+                return None
+            raise
+    with ThreadPoolExecutor(max_workers=workers or min(32, len(names) or 1)) as ex:
+        texts = list(ex.map(one, names))
+    return {n: t for n, t in zip(names, texts) if t is not None}
+
+_WORKER_TEMPLATE = None
+
+def _init_render_worker(source: str, backend: Backend, code_cache: bool | Path, compose) -> None:
+    # spawn/forkserver workers start from a fresh import: adopt the caller's store, code
+    # cache and composition rule so includes resolve and compiled code lands where the caller's does
+    global _WORKER_TEMPLATE, _BACKEND, CODE_CACHE, COMPOSE
+    _BACKEND, CODE_CACHE, COMPOSE = backend, code_cache, compose
+    _WORKER_TEMPLATE = _compile(source)  # once per worker process, usually from the code cache
+
+def _check_picklable_rule(mp_context) -> None:
+    """Outside fork, workers receive COMPOSE pickled: fail with a clear error, not in the pool."""
+    if not callable(COMPOSE):
+        return
+    import multiprocessing
+    import pickle
+    if (mp_context or multiprocessing).get_start_method() == "fork":
+        return
+    try:
+        pickle.dumps(COMPOSE)
+    except Exception as e:
+        raise TypeError(f"use_composition(allow=...) predicate {COMPOSE!r} cannot be sent to "
+                        "spawn/forkserver workers: use a module-level function or name prefixes") from e
+
+def _render_chunk_in_worker(chunk: List[Mapping[str, Any]]) -> List[str]:
+    return [_WORKER_TEMPLATE.render(**c) for c in chunk]
+
+def render_many(
+    prompt_id: str,
+    contexts: Iterable[Mapping[str, Any]],
+    *,
+    workers: Optional[int] = None,
+    processes: bool = False,
+    ordered: bool = True,
+    chunksize: int = 64,
+    validate: bool = False,
+    mp_context=None,
+) -> Iterator:
+    """
+    Render the current prompt once-compiled against many contexts.
+    Yields texts in input order (ordered=True) or (index, text) as they finish.
+    Threads share one template; processes=True compiles once per worker and
+    sidesteps the GIL for CPU-heavy templates (mp_context: a multiprocessing
+    context, e.g. spawn; workers get the active backend, which must be picklable, and composition rule).
+    The prompt is resolved when called. Input is consumed lazily, except with
+    validate=True: every context is checked before render_many returns.
+    """
+    tmpl = template(prompt_id)  # a missing prompt raises here, not on the first next()
+    if validate:
+        contexts = list(contexts)
+        for i, c in enumerate(contexts):
+            _check(prompt_id, tmpl, c, i)
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    workers = workers or os.cpu_count() or 1
+    if processes:
+        _check_picklable_rule(mp_context)
+        pool = functools.partial(ProcessPoolExecutor, max_workers=workers, mp_context=mp_context,
+                                 initializer=_init_render_worker,
+                                 initargs=(get(prompt_id), _BACKEND, CODE_CACHE, COMPOSE))
+        task = _render_chunk_in_worker
+    else:
+        pool = functools.partial(ThreadPoolExecutor, max_workers=workers)
+        task = lambda chunk: [tmpl.render(**c) for c in chunk]  # noqa: E731
+    return _render_chunks(pool, task, contexts, workers, ordered, chunksize)
+
+def _render_chunks(pool: Callable, task: Callable, contexts: Iterable[Mapping[str, Any]], workers: int,
+                   ordered: bool, chunksize: int) -> Iterator:
+    """render_many's generator: the pool is started on the first next() and shut down at the end."""
+    from concurrent.futures import FIRST_COMPLETED, wait
+
+    def chunks():
+        buf: List[Mapping[str, Any]] = []
+        for c in contexts:
+            buf.append(c)
+            if len(buf) >= chunksize:
+                yield buf
+                buf = []
+        if buf:
+            yield buf
+
+    window = workers * 2  # chunks in flight: memory stays bounded for huge inputs
+    ex = pool()
+    try:
+        pending: Dict[Any, int] = {}
+        done: Dict[int, List[str]] = {}
+        start = next_out = 0
+        source = chunks()
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < window:
+                chunk = next(source, None)
+                if chunk is None:
+                    exhausted = True
+                    break
+                pending[ex.submit(task, chunk)] = start
+                start += len(chunk)
+            if not pending:
+                break
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                offset = pending.pop(fut)
+                if ordered:
+                    done[offset] = fut.result()
+                else:
+                    for i, text in enumerate(fut.result()):
+                        yield offset + i, text
+            while next_out in done:
+                out = done.pop(next_out)
+                next_out += len(out)
+                yield from out
+    finally:
+        ex.shutdown(wait=True, cancel_futures=True)
+
+@_metrics.timed("save_many")
+def save_many(items: Iterable, *, fsync: bool = False) -> List[Dict[str, Any]]:
+    """
+    Save many prompts; items are (name, text), (name, text, metadata) or
+    {"name", "text", "metadata"} mappings. Per prompt the head, directory,
+    latest.txt, index append and head record are handled once for the batch.
+    fsync=True makes the batch durable with one directory sync per prompt.
+    """
+    groups: Dict[str, List[tuple]] = {}
+    for pos, item in enumerate(items):
+        if isinstance(item, Mapping):
+            name, text, md = item["name"], item["text"], item.get("metadata")
+        else:
+            name, text, md = (tuple(item) + (None,))[:3]
+        groups.setdefault(name, []).append((pos, text, md))
+
+    results = _BACKEND.put_many(groups, fsync=fsync)
+    return [results[pos] for pos in sorted(results)]
@@ -0,0 +1,153 @@
+# parolo/aio.py
+"""
+Asyncio facade for the prompts and tenants namespaces.
+Blocking file I/O runs in a bounded thread pool; concurrent identical reads and
+renders share one in-flight call (single-flight). Caches are the sync API's.
+"""
+from __future__ import annotations
+import asyncio
+import functools
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+from . import _core
+from . import tenants as _tenants
+
+_MAX_WORKERS = int(os.environ.get("PAROLO_AIO_WORKERS", "8"))
+_executor: Optional[Executor] = None
+_inflight: Dict[tuple, asyncio.Future] = {}
+
+def set_executor(executor: Optional[Executor] = None, *, max_workers: Optional[int] = None) -> None:
+    """Use a custom executor, or resize the default bounded pool."""
+    global _executor, _MAX_WORKERS
+    old, _executor = _executor, executor
+    if max_workers is not None:
+        _MAX_WORKERS = max_workers
+    if old is not None and old is not executor:
+        old.shutdown(wait=False)
+
+def _pool() -> Executor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=_MAX_WORKERS, thread_name_prefix="parolo-aio")
+    return _executor
+
+async def _run(fn: Callable, /, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_pool(), functools.partial(fn, *args, **kwargs))
+
+async def _shared(key: Optional[Hashable], call: Callable[[], Any]):
+    """Run call() once for all concurrent callers with the same key (None: no sharing)."""
+    if key is None:
+        return await _run(call)
+    loop = asyncio.get_running_loop()
+    k = (loop, _core.get_backend().key, key)
+    fut = _inflight.get(k)
+    if fut is None:
+        fut = loop.run_in_executor(_pool(), call)
+        _inflight[k] = fut
+        fut.add_done_callback(lambda _: _inflight.pop(k, None))
+    return await asyncio.shield(fut)
+
+def _typed(v: Any) -> Hashable:
+    """v with its type at every level: 1, True and 1.0 render differently, so they must not share."""
+    t = type(v)
+    if t is tuple or t is list:
+        return t, tuple(_typed(x) for x in v)
+    if t is dict:
+        return t, frozenset((_typed(k), _typed(x)) for k, x in v.items())
+    if t is set or t is frozenset:
+        return t, frozenset(_typed(x) for x in v)
+    hash(v)
+    return t, v
+
+def _context_key(context: Dict[str, Any]) -> Optional[Hashable]:
+    try:
+        return frozenset((k, _typed(v)) for k, v in context.items())
+    except TypeError:  # unhashable values: render without sharing
+        return None
+
+# -------- prompts --------
+async def read(name: str) -> str:
+    return await _shared(("read", name), functools.partial(_core.get, name))
+
+async def read_version(name: str, version: str) -> str:
+    return await _shared(("read_version", name, version),
+                         functools.partial(_core.get_version, name, version))
+
+async def read_many(names: Iterable[str]) -> Dict[str, str]:
+    names = list(dict.fromkeys(names))
+    texts = await asyncio.gather(*(read(n) for n in names))
+    return dict(zip(names, texts))
+
+async def meta(name: str, version: str) -> Dict[str, Any]:
+    return await _shared(("meta", name, version), functools.partial(_core.meta_version, name, version))
+
+async def versions(name: str, *, with_meta: bool = False):
+    return await _shared(("versions", name, with_meta),
+                         functools.partial(_core.list_versions, name, with_meta=with_meta))
+
+async def list_all(*, with_meta: bool = True):
+    return await _shared(("list", with_meta), functools.partial(_core.list_all, with_meta=with_meta))
+
+async def token(name: str) -> int:
+    return await _run(_core.token, name)
+
+async def render(prompt_id: str, /, **context) -> str:
+    ck = _context_key(context)
+    return await _shared(None if ck is None else ("render", prompt_id, ck),
+                         functools.partial(_core.render, prompt_id, **context))
+
+async def render_version(prompt_id: str, version: str, /, **context) -> str:
+    ck = _context_key(context)
+    return await _shared(None if ck is None else ("render_version", prompt_id, version, ck),
+                         functools.partial(_core.render_version, prompt_id, version, **context))
+
+async def save(name: str, text: str, *, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    return await _run(_core.put, name, text, metadata=metadata)
+
+prompts = SimpleNamespace(
+    read=read, read_version=read_version, read_many=read_many, meta=meta,
+    versions=versions, list=list_all, token=token, render=render,
+    render_version=render_version, save=save,
+)
+
+# -------- tenants --------
+async def tenants_read(tenant_id: str, agent_id: str, *, semver: Optional[str] = None,
+                       fallback: Optional[Callable[[], Optional[str]]] = None) -> str:
+    key = None if fallback else ("tenants.read", tenant_id, agent_id, semver)
+    return await _shared(key, functools.partial(_tenants.read, tenant_id, agent_id,
+                                                semver=semver, fallback=fallback))
+
+async def tenants_read_cached(tenant_id: str, agent_id: str) -> str:
+    return await _shared(("tenants.read_cached", tenant_id, agent_id),
+                         functools.partial(_tenants.read_cached, tenant_id, agent_id))
+
+async def tenants_save(tenant_id: str, agent_id: str, text: str, **kwargs) -> Dict[str, str]:
+    return await _run(_tenants.save, tenant_id, agent_id, text, **kwargs)
+
+async def tenants_list_semvers(tenant_id: str, agent_id: str):
+    return await _run(_tenants.list_semvers, tenant_id, agent_id)
+
+async def tenants_latest_semver(tenant_id: str, agent_id: str) -> Optional[str]:
+    return await _run(_tenants.latest_semver, tenant_id, agent_id)
+
+async def tenants_resolve(tenant_id: str, agent_id: str, spec: str) -> Optional[str]:
+    return await _run(_tenants.resolve, tenant_id, agent_id, spec)
+
+async def tenants_ensure_initial(tenant_id: str, agent_id: str, text: str, **kwargs) -> Optional[str]:
+    return await _run(_tenants.ensure_initial, tenant_id, agent_id, text, **kwargs)
+
+tenants = SimpleNamespace(
+    key=_tenants.key,
+    read=tenants_read,
+    read_cached=tenants_read_cached,
+    save=tenants_save,
+    list_semvers=tenants_list_semvers,
+    latest_semver=tenants_latest_semver,
+    resolve=tenants_resolve,
+    ensure_initial=tenants_ensure_initial,
+    invalidate=_tenants.invalidate,
+)
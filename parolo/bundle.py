@@ -0,0 +1,136 @@
+# parolo/bundle.py
+"""
+Single-file, read-only prompt bundles for fast cold starts.
+
+Layout: MAGIC | u64 header length | header JSON | data. The header maps
+name -> [latest offset, latest length, token, meta offset, meta length]; each
+meta blob is JSON {"entries": [index entries], "versions": {vNNNN: [offset, length]}}
+and is decoded only when first needed. Identical texts are stored once.
+Offsets are relative to the start of the data section.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from . import _core
+
+MAGIC = b"PAROLOB1"
+_LEN = struct.Struct("<Q")
+
+def export_bundle(path: str | Path, *, versions: bool = False,
+                  names: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """Compile the store (latest texts, metadata, optionally all versions) into one file."""
+    names = sorted(names) if names is not None else [p["name"] for p in _core.list_all(with_meta=False)]
+    data = bytearray()
+    offsets: Dict[str, List[int]] = {}  # text hash -> [offset, length]
+
+    def add(raw: bytes) -> List[int]:
+        h = hashlib.sha256(raw).hexdigest()
+        if h not in offsets:
+            offsets[h] = [len(data), len(raw)]
+            data.extend(raw)
+        return offsets[h]
+
+    header: Dict[str, List[int]] = {}
+    for name in names:
+        try:
+            latest = add(_core.get(name).encode("utf-8"))
+        except FileNotFoundError:
+            continue
+        entries = _core.get_backend().entries(name)[0]
+        vmap = {e["version"]: add(_core.get_version(name, e["version"]).encode("utf-8"))
+                for e in entries} if versions else {}
+        meta = json.dumps({"entries": entries, "versions": vmap}, separators=(",", ":")).encode("utf-8")
+        header[name] = latest + [_core.token(name)] + add(meta)
+
+    head = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(MAGIC + _LEN.pack(len(head)) + head)
+        fh.write(data)
+    os.replace(tmp, path)
+    return {"prompts": len(header), "texts": len(offsets), "bytes": len(MAGIC) + _LEN.size + len(head) + len(data)}
+
+class Bundle(_core.Backend):
+    """Read-only backend over a bundle file: one open + mmap, texts sliced on demand."""
+    read_only = True
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path).resolve()
+        self.key = ("bundle", self.path)
+        with open(self.path, "rb") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{self.path} is not a parolo bundle")
+        (n,) = _LEN.unpack_from(self._mm, len(MAGIC))
+        start = len(MAGIC) + _LEN.size
+        self._header: Dict[str, List[int]] = json.loads(self._mm[start:start + n])
+        self._data = start + n
+        self._meta: Dict[str, Dict[str, Any]] = {}
+
+    def _slice(self, off: int, length: int) -> bytes:
+        return self._mm[self._data + off:self._data + off + length]
+
+    def _meta_of(self, name: str) -> Dict[str, Any]:
+        m = self._meta.get(name)
+        if m is None:
+            rec = self._header.get(name)
+            m = json.loads(self._slice(rec[3], rec[4])) if rec else {"entries": [], "versions": {}}
+            m["by_version"] = {e["version"]: e for e in m["entries"]}
+            self._meta[name] = m
+        return m
+
+    def names(self) -> List[str]:
+        return sorted(self._header)
+
+    def __repr__(self) -> str:
+        return f"Bundle({str(self.path)!r})"
+
+    def __reduce__(self):  # reopened (and re-mapped) on unpickling, e.g. in render_many workers
+        return Bundle, (self.path,)
+
+    def put(self, name: str, text: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        raise PermissionError(f"cannot save {name!r}: serving from read-only bundle {self.path}")
+
+    def get(self, name: str) -> str:
+        rec = self._header.get(name)
+        if rec is None:
+            raise FileNotFoundError(f"{name} not in bundle {self.path}")
+        return self._slice(rec[0], rec[1]).decode("utf-8")
+
+    def get_version(self, name: str, version: str) -> str:
+        stem = version[:-4] if version.endswith(".txt") else version
+        loc = self._meta_of(name)["versions"].get(stem)
+        if loc is None:
+            raise FileNotFoundError(f"{name} {version} not found")
+        return self._slice(*loc).decode("utf-8")
+
+    def token(self, name: str) -> int:
+        rec = self._header.get(name)
+        return rec[2] if rec else 0
+
+    def entries(self, name: str):
+        m = self._meta_of(name)
+        return m["entries"], m["by_version"]
+
+    def close(self) -> None:
+        self._mm.close()
+
+def open_bundle(path: str | Path) -> Bundle:
+    """Serve the prompts/tenants API read-only from a bundle (saves raise PermissionError)."""
+    b = Bundle(path)
+    close_bundle()
+    _core.use_backend(b)
+    return b
+
+def close_bundle() -> None:
+    """Go back to the filesystem store."""
+    if isinstance(_core.get_backend(), Bundle):
+        _core.use_backend(None)
@@ -0,0 +1,175 @@
+# parolo/memory_store.py
+"""
+In-memory storage backend.
+
+MemoryBackend() is a complete process-local store (nothing is persisted):
+versions, hashes, metadata and token() behave as in the file store.
+MemoryBackend(source) is a read-through cache in front of another backend:
+saves go to the source, reads are served from memory while the source's
+stamp/token is unchanged, and stored versions are cached for good.
+"""
+from __future__ import annotations
+import itertools
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from . import _core
+
+_KEYS = itertools.count(1)
+
+# read-through entries of every MemoryBackend(source): (backend key, name, kind, ...)
+_CACHED = _core._LRU(int(os.environ.get("PAROLO_MEMORY_CACHE", "4096")))
+
+@_core.on_invalidate
+def _drop_cached(name: Optional[str]) -> None:
+    _CACHED.discard(lambda k: name is None or k[1] == name)
+
+class MemoryBackend(_core.Backend):
+    """A process-local store, or a read-through cache over `source` (see module docstring)."""
+
+    def __init__(self, source: Optional[_core.Backend] = None):
+        self.source = source
+        self.key = ("memory", next(_KEYS))
+        self._lock = threading.Lock()
+        self._latest: Dict[str, tuple] = {}     # name -> (token, text, hash)
+        self._history: Dict[str, tuple] = {}    # name -> (entries, by_version, texts)
+        self._generation = 0
+        self._written: Dict[str, int] = {}      # name -> generation of its last write
+
+    def __repr__(self) -> str:
+        return f"MemoryBackend({self.source!r})" if self.source is not None else "MemoryBackend()"
+
+    def __getstate__(self) -> Dict[str, Any]:  # a snapshot (e.g. for render_many workers)
+        with self._lock:
+            return {k: v for k, v in self.__dict__.items() if k != "_lock"}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def read_only(self) -> bool:
+        return self.source is not None and self.source.read_only
+
+    # -------- save --------
+    def put(self, name: str, text: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        if self.source is not None:
+            return self.source.put(name, text, metadata)
+        cur_hash = _core._sha256(text)
+        with self._lock:
+            cur = self._latest.get(name)
+            if cur is not None and cur[2] == cur_hash:
+                return _core._save_info(self._history[name][0][-1]["version"], cur_hash, text)
+            entries, by_version, texts = self._history.setdefault(name, ([], {}, []))
+            m = _core._version_meta(f"v{len(entries) + 1:04d}", text, cur_hash,
+                                    cur[2] if cur else None, metadata)
+            m = json.loads(json.dumps(m))  # same JSON round trip as the stores on disk
+            entries.append(m)
+            by_version[m["version"]] = m
+            texts.append(text)
+            tok = max(time.time_ns(), cur[0] + 1 if cur else 0)  # strictly increasing per prompt
+            self._latest[name] = (tok, text, cur_hash)
+            self._generation += 1
+            self._written[name] = self._generation
+        return {"version": m["version"], "hash": cur_hash, "size": m["size"], "lines": m["line_count"]}
+
+    def put_many(self, groups: Dict[str, List[tuple]], *, fsync: bool = False) -> Dict[int, Dict[str, Any]]:
+        if self.source is not None:
+            return self.source.put_many(groups, fsync=fsync)
+        return super().put_many(groups)
+
+    # -------- read --------
+    def get(self, name: str) -> str:
+        return self.read_latest(name)[1]
+
+    def read_latest(self, name: str):
+        if self.source is None:
+            cur = self._latest.get(name)
+            if cur is None:
+                raise FileNotFoundError(f"{name} not found in memory store")
+            return cur[0], cur[1]
+        key = (self.key, name, "latest")
+        stamp = self.source.stamp(name)
+        hit = _CACHED.get(key)
+        if hit is not None and hit[0] == stamp:
+            return hit
+        hit = self.source.read_latest(name)
+        _CACHED.put(key, hit)
+        return hit
+
+    def get_version(self, name: str, version: str) -> str:
+        stem = _core._stem(version)
+        if self.source is None:
+            e = self._history.get(name)
+            if e is None or stem not in e[1]:
+                raise FileNotFoundError(f"{name} {version} not found")
+            return e[2][int(stem[1:]) - 1]
+        key = (self.key, name, "version", stem)  # versions are immutable
+        text = _CACHED.get(key)
+        if text is None:
+            text = self.source.get_version(name, stem)
+            _CACHED.put(key, text)
+        return text
+
+    def entries(self, name: str):
+        if self.source is None:
+            e = self._history.get(name)
+            return (e[0], e[1]) if e else ([], {})
+        # a new version always changes latest, so its stamp validates the listing
+        key = (self.key, name, "entries")
+        try:
+            stamp = self.source.stamp(name)
+        except FileNotFoundError:
+            return [], {}
+        hit = _CACHED.get(key)
+        if hit is not None and hit[0] == stamp:
+            return hit[1]
+        entries = self.source.entries(name)
+        _CACHED.put(key, (stamp, entries))
+        return entries
+
+    def meta(self, name: str, stem: str) -> Dict[str, Any]:
+        if self.source is None:
+            return super().meta(name, stem)
+        return super().meta(name, stem) or self.source.meta(name, stem)
+
+    def names(self) -> List[str]:
+        if self.source is not None:
+            return self.source.names()
+        return sorted(self._latest)
+
+    def token(self, name: str) -> int:
+        if self.source is not None:
+            return self.source.token(name)
+        cur = self._latest.get(name)
+        return cur[0] if cur else 0
+
+    def stamp(self, name: str):
+        return self.source.stamp(name) if self.source is not None else self.token(name)
+
+    def generation(self):
+        return self.source.generation() if self.source is not None else self._generation
+
+    def changes_since(self, generation):
+        if self.source is not None:
+            return self.source.changes_since(generation)
+        if generation is None:
+            return None
+        with self._lock:
+            return self._generation, {n for n, g in self._written.items() if g > generation}
+
+    def list_all(self, *, with_meta: bool = True) -> List[Dict[str, Any]]:
+        if self.source is not None:
+            return self.source.list_all(with_meta=with_meta)
+        return super().list_all(with_meta=with_meta)
+
+    def clear(self) -> None:
+        """Forget every prompt (standalone) or every cached read (read-through)."""
+        with self._lock:
+            self._latest.clear()
+            self._history.clear()
+            self._written.clear()
+        _CACHED.discard(lambda k: k[0] == self.key)
@@ -0,0 +1,116 @@
+# parolo/metrics.py
+"""
+Opt-in instrumentation: per-operation latency histograms, I/O and parse
+counters, and tracer hooks for exporting to a metrics stack.
+
+Off by default (PAROLO_METRICS=1 or enable() turns it on). When off, a timed
+call costs one flag check and counters are skipped by their callers.
+"""
+from __future__ import annotations
+import functools
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+ENABLED = os.environ.get("PAROLO_METRICS", "") not in ("", "0")
+
+# tracer(op, seconds, error): called after every timed operation while enabled
+Tracer = Callable[[str, float, Optional[BaseException]], None]
+
+_lock = threading.Lock()
+_counters: Dict[str, int] = {}
+_hists: Dict[str, "_Histogram"] = {}
+_tracers: List[Tracer] = []
+
+class _Histogram:
+    """Latencies in power-of-two microsecond buckets (bucket i: < 2**i us)."""
+    __slots__ = ("buckets", "count", "total_ns", "max_ns")
+
+    def __init__(self):
+        self.buckets = [0] * 40
+        self.count = self.total_ns = self.max_ns = 0
+
+    def add(self, ns: int) -> None:
+        self.buckets[min(39, (ns // 1000).bit_length())] += 1
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def quantile(self, q: float) -> float:
+        """Upper bound (us) of the bucket holding quantile q."""
+        rank, seen = q * self.count, 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return float(2 ** i)
+        return 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"count": self.count,
+                "mean_us": round(self.total_ns / self.count / 1000, 2) if self.count else 0.0,
+                "p50_us": self.quantile(0.50), "p95_us": self.quantile(0.95),
+                "p99_us": self.quantile(0.99), "max_us": round(self.max_ns / 1000, 2)}
+
+def enable(enabled: bool = True) -> None:
+    """Turn instrumentation on (or off); collected numbers are kept."""
+    global ENABLED
+    ENABLED = enabled
+
+def add_tracer(fn: Tracer) -> Tracer:
+    """Register fn(op, seconds, error); usable as a decorator."""
+    _tracers.append(fn)
+    return fn
+
+def remove_tracer(fn: Tracer) -> None:
+    _tracers.remove(fn)
+
+def count(name: str, n: int = 1) -> None:
+    """Add n to a counter. Callers guard with `if metrics.ENABLED`."""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+def observe(op: str, seconds: float, error: Optional[BaseException] = None) -> None:
+    with _lock:
+        h = _hists.get(op)
+        if h is None:
+            h = _hists[op] = _Histogram()
+        h.add(int(seconds * 1e9))
+        _counters[f"{op}.errors"] = _counters.get(f"{op}.errors", 0) + (error is not None)
+    for fn in list(_tracers):
+        fn(op, seconds, error)
+
+def timed(op: str) -> Callable[[Callable], Callable]:
+    """Decorator: record the latency of every call as operation `op` while enabled."""
+    def deco(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                out = fn(*args, **kwargs)
+            except BaseException as e:
+                observe(op, time.perf_counter() - t0, e)
+                raise
+            observe(op, time.perf_counter() - t0)
+            return out
+        return wrapper
+    return deco
+
+def stats() -> Dict[str, Any]:
+    """Snapshot: {"enabled", "counters", "ops": {op: latency summary}, "caches"}."""
+    from . import _core
+    with _lock:
+        out = {"enabled": ENABLED, "counters": {k: v for k, v in sorted(_counters.items()) if v},
+               "ops": {op: h.snapshot() for op, h in sorted(_hists.items())}}
+    out["caches"] = {"templates": _core._TEMPLATES.info(), "indexes": _core._INDEXES.info(),
+                     "packs": _core._PACKS.info()}
+    return out
+
+def reset() -> None:
+    """Zero all counters and histograms."""
+    with _lock:
+        _counters.clear()
+        _hists.clear()
@@ -1,15 +1,23 @@
 from __future__ import annotations
 import hashlib
-import json
 import os
 from datetime import datetime
 from pathlib import Path
+from typing import Dict
+
+from ._core import FileBackend
+from . import metrics as _metrics
+
+# one FileBackend per base_dir (Prompt.base_dir may be reassigned at any time)
+_STORES: Dict[Path, FileBackend] = {}
 
 class Prompt:
     # Default base_dir is relative to where this file lives
     base_dir = Path(
         os.environ.get("PAROLO_HOME", Path.home() / ".parolo" / "prompts")
     )
+    # console messages from create/list_versions/overview (log/show_version_info always print)
+    verbose = os.environ.get("PAROLO_VERBOSE", "") not in ("", "0")
 
     @staticmethod
     def _hash(text: str) -> str:
@@ -20,91 +28,56 @@ class Prompt:
         cls.base_dir = Path(path).resolve()
 
     @classmethod
-    def create(cls, name: str, prompt: str, metadata: dict = None):
-        prompt_dir = cls.base_dir / name
-        versions_dir = prompt_dir / "versions"
-        latest_file = prompt_dir / "latest.txt"
-        versions_dir.mkdir(parents=True, exist_ok=True)
-
-        current_hash = cls._hash(prompt)
-
-        # Compare to latest version hash
-        existing_versions = sorted(versions_dir.glob("v*.txt"))
-        last_hash = None
-        if existing_versions:
-            last_text = existing_versions[-1].read_text(encoding="utf-8")
-            last_hash = cls._hash(last_text)
-
-        # Always refresh latest.txt
-        latest_file.write_text(prompt, encoding="utf-8")
-        print(f"[Prompt] Updated latest.txt for '{name}'")
-
-        if (not existing_versions) or (current_hash != last_hash):
-            version_num = len(existing_versions) + 1
-            version_file = versions_dir / f"v{version_num:04d}.txt"
-            metadata_file = versions_dir / f"v{version_num:04d}.json"
+    def _store(cls) -> FileBackend:
+        store = _STORES.get(cls.base_dir)
+        if store is None:
+            store = _STORES[cls.base_dir] = FileBackend(cls.base_dir)
+        return store
 
-            # Save prompt content
-            version_file.write_text(prompt, encoding="utf-8")
-
-            # Prepare metadata
-            commit_metadata = {
-                "hash": current_hash,
-                "timestamp": datetime.now().isoformat(),
-                "version": f"v{version_num:04d}",
-                "size": len(prompt.encode("utf-8")),
-                "line_count": len(prompt.splitlines()),
-                "previous_hash": last_hash,  # None on first version
-                "metadata": metadata or {},
-            }
-
-            # Save metadata
-            metadata_file.write_text(json.dumps(commit_metadata, indent=2), encoding="utf-8")
+    @classmethod
+    def _say(cls, msg: str) -> None:
+        if cls.verbose:
+            print(msg)
 
-            print(f"[Prompt] New version saved: {version_file}")
-            print(f"[Prompt] Metadata saved: {metadata_file}")
+    @classmethod
+    @_metrics.timed("Prompt.create")
+    def create(cls, name: str, prompt: str, metadata: dict = None):
+        """Save prompt as the latest text; a new version is written only if it changed."""
+        store = cls._store()
+        before = store._peek_head(name)
+        info = store.put(name, prompt, metadata)
+        if before is None or before.get("version") != info["version"]:
+            cls._say(f"[Prompt] New version saved: {store._vdir(name) / (info['version'] + '.txt')}")
         else:
-            print("[Prompt] No changes detected — no new version created.")
+            cls._say("[Prompt] No changes detected — no new version created.")
+        return info
 
     @classmethod
+    @_metrics.timed("Prompt.list_versions")
     def list_versions(cls, name: str, show_metadata: bool = False) -> list:
-        versions_dir = cls.base_dir / name / "versions"
-        if not versions_dir.exists():
-            print(f"[Prompt] No versions found for '{name}'")
+        entries = cls._store().entries(name)[0]
+        if not entries:
+            cls._say(f"[Prompt] No versions found for '{name}'")
             return []
-        files = sorted(versions_dir.glob("v*.txt"))
-        versions = [f.name for f in files]  # ensure 'v0001.txt' shape
-        print(f"[Prompt] Versions for '{name}':")
-        if show_metadata:
-            for f in files:
-                mfile = versions_dir / f"{f.stem}.json"
-                if mfile.exists():
-                    try:
-                        metadata = json.loads(mfile.read_text(encoding="utf-8"))
-                        ts = datetime.fromisoformat(metadata["timestamp"]).strftime("%Y-%m-%d %H:%M:%S")
-                        h = metadata["hash"][:8]
-                        print(f"  - {f.name} ({ts}) [{h}]")
-                    except Exception:
-                        print(f"  - {f.name} [metadata error]")
-                else:
-                    print(f"  - {f.name} [no metadata]")
-        else:
-            for v in versions:
-                print(f"  - {v}")
+        versions = [f"{e['version']}.txt" for e in entries]  # ensure 'v0001.txt' shape
+        cls._say(f"[Prompt] Versions for '{name}':")
+        for e, v in zip(entries, versions):
+            if show_metadata:
+                try:
+                    ts = datetime.fromisoformat(e["timestamp"]).strftime("%Y-%m-%d %H:%M:%S")
+                    cls._say(f"  - {v} ({ts}) [{e['hash'][:8]}]")
+                except Exception:
+                    cls._say(f"  - {v} [metadata error]")
+            else:
+                cls._say(f"  - {v}")
         return versions
 
     @classmethod
+    @_metrics.timed("Prompt.get_metadata")
     def get_metadata(cls, name: str, version: str) -> dict:
         """Get metadata for a specific version; accepts 'v0001' or 'v0001.txt'."""
-        versions_dir = cls.base_dir / name / "versions"
         stem = version[:-4] if version.endswith(".txt") else version
-        metadata_file = versions_dir / f"{stem}.json"
-        if not metadata_file.exists():
-            return {}
-        try:
-            return json.loads(metadata_file.read_text(encoding="utf-8"))
-        except json.JSONDecodeError:
-            return {}
+        return cls._store().meta(name, stem)
 
     @classmethod
     def show_version_info(cls, name: str, version: str):
@@ -124,61 +97,52 @@ class Prompt:
 
     @classmethod
     def log(cls, name: str, limit: int = 10):
-        versions_dir = cls.base_dir / name / "versions"
-        if not versions_dir.exists():
+        entries = cls._store().entries(name)[0]
+        if not entries:
             print(f"[Prompt] No versions found for '{name}'")
             return
-        files = sorted(versions_dir.glob("v*.txt"), reverse=True)[:limit]
         print(f"[Prompt] Version History for '{name}':")
-        for f in files:
-            mfile = versions_dir / f"{f.stem}.json"
-            if mfile.exists():
-                try:
-                    metadata = json.loads(mfile.read_text(encoding="utf-8"))
-                    ts = datetime.fromisoformat(metadata["timestamp"]).strftime("%Y-%m-%d %H:%M:%S")
-                    h = metadata["hash"][:8]
-                    print("")
-                    print(f"Version: {metadata['version']}")
-                    print(f"Hash: {h}")
-                    print(f"Date: {ts}")
-                    print(f"Size: {metadata['size']} bytes, {metadata['line_count']} lines")
-                    if metadata.get("metadata"):
-                        print(f"Metadata: {metadata['metadata']}")
-                except Exception:
-                    print(f"  {f.name} [metadata error]")
-            else:
-                print(f"  {f.name} [no metadata]")
+        for metadata in entries[::-1][:limit]:
+            try:
+                ts = datetime.fromisoformat(metadata["timestamp"]).strftime("%Y-%m-%d %H:%M:%S")
+                h = metadata["hash"][:8]
+                print("")
+                print(f"Version: {metadata['version']}")
+                print(f"Hash: {h}")
+                print(f"Date: {ts}")
+                print(f"Size: {metadata['size']} bytes, {metadata['line_count']} lines")
+                if metadata.get("metadata"):
+                    print(f"Metadata: {metadata['metadata']}")
+            except Exception:
+                print(f"  {metadata.get('version')}.txt [metadata error]")
 
     @classmethod
+    @_metrics.timed("Prompt.get_prompt")
     def get_prompt(cls, name: str, version: str = "latest") -> str:
-        prompt_dir = cls.base_dir / name
-        if version == "latest":
-            prompt_file = prompt_dir / "latest.txt"
-        else:
-            version_name = version if version.endswith(".txt") else f"{version}.txt"
-            prompt_file = prompt_dir / "versions" / version_name
-        if not prompt_file.exists():
-            raise FileNotFoundError(f"Prompt '{name}' version '{version}' not found")
-        return prompt_file.read_text(encoding="utf-8")
+        store = cls._store()
+        try:
+            return store.get(name) if version == "latest" else store.get_version(name, version)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Prompt '{name}' version '{version}' not found") from None
 
     @classmethod
+    @_metrics.timed("Prompt.format_prompt")
     def format_prompt(cls, prompt_name: str, version: str = "latest", **kwargs) -> str:
         text = cls.get_prompt(prompt_name, version)
         return text.format(**kwargs) if kwargs else text
 
     @classmethod
+    @_metrics.timed("Prompt.overview")
     def overview(cls) -> dict:
-        overview_data = {}
         if not cls.base_dir.exists():
-            print(f"[Prompt] Base directory '{cls.base_dir}' does not exist.")
-            return overview_data
-        for prompt_dir in cls.base_dir.iterdir():
-            if prompt_dir.is_dir():
-                versions_dir = prompt_dir / "versions"
-                if versions_dir.exists():
-                    count = len(list(versions_dir.glob("v*.txt")))
-                    overview_data[prompt_dir.name] = count
-        print("[Prompt] Overview:")
+            cls._say(f"[Prompt] Base directory '{cls.base_dir}' does not exist.")
+            return {}
+        store = cls._store()
+        overview_data = {}
+        for name in store.names():
+            if store._vdir(name).exists():
+                overview_data[name] = len(store.entries(name)[0])
+        cls._say("[Prompt] Overview:")
         for name, count in overview_data.items():
-            print(f"  - {name}: {count} version(s)")
+            cls._say(f"  - {name}: {count} version(s)")
         return overview_data
@@ -0,0 +1,203 @@
+# parolo/sqlite_store.py
+"""
+SQLite storage backend: one database file in WAL mode instead of the
+latest.txt / versions/ tree.
+
+    prompts(name PK, latest, version, hash, token)
+    versions(name, n, text, meta, PK(name, n))
+
+Listing and history are indexed queries; a save allocates its version number
+inside a BEGIN IMMEDIATE transaction, so any number of threads and processes
+on one host can write concurrently. Readers never block writers (WAL).
+Tokens increase across the whole database, so the largest one is the store
+generation and `token > generation` lists what changed since.
+"""
+from __future__ import annotations
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from . import _core
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS prompts (
+    name    TEXT PRIMARY KEY,
+    latest  TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    hash    TEXT NOT NULL,
+    token   INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS prompts_token ON prompts (token);
+CREATE TABLE IF NOT EXISTS versions (
+    name TEXT NOT NULL,
+    n    INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    meta TEXT NOT NULL,
+    PRIMARY KEY (name, n)
+) WITHOUT ROWID;
+"""
+
+class SQLiteBackend(_core.Backend):
+    """Prompts and their versions in one SQLite database (see module docstring)."""
+
+    def __init__(self, path: str | os.PathLike, *, timeout: float = 30.0):
+        self.path = Path(path).expanduser().resolve()
+        self.key = ("sqlite", self.path)
+        self.timeout = timeout
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn().executescript(_SCHEMA)
+
+    def __repr__(self) -> str:
+        return f"SQLiteBackend({str(self.path)!r})"
+
+    def __getstate__(self) -> Dict[str, Any]:  # connections stay behind (e.g. render_many workers)
+        return {"path": self.path, "key": self.key, "timeout": self.timeout}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread (and per process, after a fork)."""
+        c = getattr(self._local, "conn", None)
+        if c is None or self._local.pid != os.getpid():
+            c = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            c.execute("PRAGMA journal_mode=WAL")
+            c.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = c, os.getpid()
+        return c
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        c = getattr(self._local, "conn", None)
+        if c is not None:
+            c.close()
+            self._local.conn = None
+
+    # -------- save --------
+    def _put_locked(self, c: sqlite3.Connection, name: str, text: str,
+                    metadata: Optional[Dict[str, Any]], cur_hash: str) -> Dict[str, Any]:
+        row = c.execute("SELECT version, hash FROM prompts WHERE name = ?", (name,)).fetchone()
+        if row is not None and row[1] == cur_hash:
+            return _core._save_info(f"v{row[0]:04d}", cur_hash, text)
+        n = row[0] + 1 if row else 1
+        m = _core._version_meta(f"v{n:04d}", text, cur_hash, row[1] if row else None, metadata)
+        (top,) = c.execute("SELECT COALESCE(MAX(token), 0) FROM prompts").fetchone()
+        tok = max(time.time_ns(), top + 1)  # strictly increasing store-wide (writes are serialized)
+        c.execute("INSERT INTO versions (name, n, text, meta) VALUES (?, ?, ?, ?)",
+                  (name, n, text, json.dumps(m, separators=(",", ":"))))
+        c.execute("INSERT INTO prompts (name, latest, version, hash, token) VALUES (?, ?, ?, ?, ?) "
+                  "ON CONFLICT(name) DO UPDATE SET latest = excluded.latest, version = excluded.version, "
+                  "hash = excluded.hash, token = excluded.token",
+                  (name, text, n, cur_hash, tok))
+        return {"version": m["version"], "hash": cur_hash, "size": m["size"], "lines": m["line_count"]}
+
+    def _transaction(self, fn, *, fsync: bool = False):
+        c = self._conn()
+        if fsync:
+            c.execute("PRAGMA synchronous=FULL")
+        c.execute("BEGIN IMMEDIATE")  # takes the write lock: version numbers cannot race
+        try:
+            out = fn(c)
+            c.execute("COMMIT")
+        except BaseException:
+            c.execute("ROLLBACK")
+            raise
+        finally:
+            if fsync:
+                c.execute("PRAGMA synchronous=NORMAL")
+        return out
+
+    def put(self, name: str, text: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        cur_hash = _core._sha256(text)
+        row = self._conn().execute("SELECT version, hash FROM prompts WHERE name = ?", (name,)).fetchone()
+        if row is not None and row[1] == cur_hash:  # unchanged: no write transaction
+            return _core._save_info(f"v{row[0]:04d}", cur_hash, text)
+        return self._transaction(lambda c: self._put_locked(c, name, text, metadata, cur_hash))
+
+    def put_many(self, groups: Dict[str, List[tuple]], *, fsync: bool = False) -> Dict[int, Dict[str, Any]]:
+        """The whole batch is one transaction."""
+        def run(c):
+            return {pos: self._put_locked(c, name, text, md, _core._sha256(text))
+                    for name, group in groups.items() for pos, text, md in group}
+        return self._transaction(run, fsync=fsync)
+
+    # -------- read --------
+    def get(self, name: str) -> str:
+        row = self._conn().execute("SELECT latest FROM prompts WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"{name} not found in {self.path}")
+        return row[0]
+
+    def _number(self, name: str, version: str) -> int:
+        stem = _core._stem(version)
+        try:
+            return int(stem[1:])
+        except ValueError:
+            raise FileNotFoundError(f"{name} {version} not found") from None
+
+    def get_version(self, name: str, version: str) -> str:
+        row = self._conn().execute("SELECT text FROM versions WHERE name = ? AND n = ?",
+                                   (name, self._number(name, version))).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"{name} {version} not found")
+        return row[0]
+
+    def entries(self, name: str):
+        c = self._conn()
+        row = c.execute("SELECT version FROM prompts WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return [], {}
+        key = (self.key, name)
+        cached = _core._INDEXES.get(key)
+        if cached is not None and cached[0] == row[0]:
+            return cached[1], cached[2]
+        entries = [json.loads(m) for (m,) in c.execute(
+            "SELECT meta FROM versions WHERE name = ? AND n <= ? ORDER BY n", (name, row[0]))]
+        by_version = {e["version"]: e for e in entries}
+        _core._INDEXES.put(key, (row[0], entries, by_version))
+        return entries, by_version
+
+    def meta(self, name: str, stem: str) -> Dict[str, Any]:
+        try:
+            n = self._number(name, stem)
+        except FileNotFoundError:
+            return {}
+        row = self._conn().execute("SELECT meta FROM versions WHERE name = ? AND n = ?", (name, n)).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def names(self) -> List[str]:
+        return [n for (n,) in self._conn().execute("SELECT name FROM prompts ORDER BY name")]
+
+    def token(self, name: str) -> int:
+        row = self._conn().execute("SELECT token FROM prompts WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else 0
+
+    def generation(self) -> int:
+        return self._conn().execute("SELECT COALESCE(MAX(token), 0) FROM prompts").fetchone()[0]
+
+    def changes_since(self, generation: Optional[int]):
+        if generation is None:
+            return None
+        rows = self._conn().execute("SELECT name, token FROM prompts WHERE token > ?", (generation,)).fetchall()
+        return max([generation] + [t for _, t in rows]), {n for n, _ in rows}
+
+    def read_latest(self, name: str):
+        row = self._conn().execute("SELECT token, latest FROM prompts WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"{name} not found in {self.path}")
+        return row[0], row[1]
+
+    def list_all(self, *, with_meta: bool = True) -> List[Dict[str, Any]]:
+        if not with_meta:
+            return [_core._listing(n, v, True, None) for n, v in self._conn().execute(
+                "SELECT name, version FROM prompts ORDER BY name")]
+        rows = self._conn().execute(
+            "SELECT p.name, p.version, v.meta FROM prompts p "
+            "JOIN versions v ON v.name = p.name AND v.n = p.version ORDER BY p.name")
+        return [_core._listing(n, v, True, json.loads(m)) for n, v, m in rows]
@@ -1,30 +1,99 @@
 # parolo/tenants.py
 from __future__ import annotations
+import json
+import os
+import sys
+import time
 from datetime import datetime
 from typing import Callable, Optional, Dict, Any, List
 
 # We rely on the namespaced API (parolo.prompts)
 from . import prompts
+from . import _core
+from . import metrics as _metrics
 
 DEFAULT_SEMVER_BASE = "1.0."
+_WILDCARDS = {"x", "X", "*"}
 
 def key(tenant_id: str, agent_id: str) -> str:
     """Build a stable prompt id like 'tenant_agent'."""
     return f"{tenant_id}_{agent_id}"
 
+# -------- semver -> vNNNN map --------
+# <prompt>/semver.json = {"upto": "vNNNN", "map": {semver: vNNNN}}; first version wins,
+# like the original metadata scan. Mappings never change, so cached hits need no I/O.
+# Bounded like read_cached's LRU: an evicted map is reloaded from semver.json (or the index).
+_semvers = _core._LRU(int(os.environ.get("PAROLO_SEMVER_CACHE", "10000")))
+
+def _semver_path(prompt_id: str):
+    return _core.get_backend()._dir(prompt_id) / "semver.json"
+
+def _read_semver_file(prompt_id: str) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(_semver_path(prompt_id).read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def _semver_map(prompt_id: str, *, refresh: bool = False) -> Dict[str, Any]:
+    """Load (and catch up from the version index) the semver map of a prompt."""
+    ck = (_core.get_backend().key, prompt_id)
+    state = _semvers.get(ck)
+    # only the file store keeps semver.json; other backends are mapped from their index in memory
+    persist = isinstance(_core.get_backend(), _core.FileBackend)
+    if state is None or refresh:
+        state = (_read_semver_file(prompt_id) if persist else None) or {"upto": None, "map": {}}
+    upto = int(state["upto"][1:]) if state["upto"] else 0
+    entries = [e for e in prompts.versions(prompt_id, with_meta=True) if int(e["version"][1:]) > upto]
+    if entries:
+        for e in entries:
+            sv = e["metadata"].get("semver")
+            if sv:
+                state["map"].setdefault(sv, e["version"])
+        state["upto"] = entries[-1]["version"]
+    if entries and persist:
+        try:
+            _core._atomic_write_text(_semver_path(prompt_id), json.dumps(state))
+        except OSError:
+            pass
+    _semvers.put(ck, state)
+    return state
+
 def _find_parolo_version_by_semver(prompt_id: str, semver: str) -> Optional[str]:
-    """Find vNNNN for a given semver in metadata."""
+    """Find vNNNN for a given semver (exact, or a range like '1.2.x')."""
+    state = _semvers.get((_core.get_backend().key, prompt_id))
+    if state and semver in state["map"]:
+        return state["map"][semver]
+    try:
+        versions = _semver_map(prompt_id, refresh=True)["map"]
+    except Exception:
+        return None
+    if semver not in versions and _is_range(semver):
+        semver = _best_match(versions, semver)
+    return versions.get(semver) if semver else None
+
+def _semver_key(semver: str) -> tuple:
+    core, _, pre = semver.partition("-")
+    nums = tuple(int(p) if p.isdigit() else -1 for p in core.split("."))
+    return (nums, not pre, pre)  # a pre-release sorts before its release
+
+def _is_range(spec: str) -> bool:
+    parts = spec.split("-")[0].split(".")
+    return len(parts) < 3 or any(p in _WILDCARDS for p in parts)
+
+def _best_match(semvers, spec: str) -> Optional[str]:
+    want = [p for p in spec.split(".") if p not in _WILDCARDS]
+    matches = [sv for sv in semvers if sv.split("-")[0].split(".")[:len(want)] == want]
+    return max(matches, key=_semver_key) if matches else None
+
+@_metrics.timed("tenants.resolve")
+def resolve(tenant_id: str, agent_id: str, spec: str) -> Optional[str]:
+    """Highest stored semver matching a range like '1.2.x', '1.*' or '2'."""
     try:
-        versions = prompts.versions(prompt_id, with_meta=True)
+        return _best_match(_semver_map(key(tenant_id, agent_id))["map"], spec)
     except Exception:
         return None
-    for entry in versions:
-        v = entry["version"]          # e.g. 'v0003'
-        meta = prompts.meta(prompt_id, v)
-        if meta and meta.get("metadata", {}).get("semver") == semver:
-            return v
-    return None
 
+@_metrics.timed("tenants.list_semvers")
 def list_semvers(tenant_id: str, agent_id: str) -> List[str]:
     """List semvers from metadata; if missing, synthesize 1.0.<i>."""
     pid = key(tenant_id, agent_id)
@@ -34,8 +103,7 @@ def list_semvers(tenant_id: str, agent_id: str) -> List[str]:
         return []
     out: List[str] = []
     for i, entry in enumerate(rich):
-        meta = prompts.meta(pid, entry["version"]) or {}
-        sv = (meta.get("metadata") or {}).get("semver")
+        sv = entry["metadata"].get("semver")
         out.append(sv if sv else f"{DEFAULT_SEMVER_BASE}{i}")
     return out
 
@@ -43,6 +111,7 @@ def latest_semver(tenant_id: str, agent_id: str) -> Optional[str]:
     semvers = list_semvers(tenant_id, agent_id)
     return semvers[-1] if semvers else None
 
+@_metrics.timed("tenants.save")
 def save(
     tenant_id: str,
     agent_id: str,
@@ -70,8 +139,12 @@ def save(
         meta.update(extra_metadata)
 
     info = prompts.save(pid, text, metadata=meta)  # writes latest.txt + vNNNN if changed
+    if not versions or info["version"] != versions[-1][:-4]:
+        _semver_map(pid)  # new version: record its semver
+        _read_cache.pop((_core.get_backend().key, pid))
     return {"semver": semver, "parolo_version": info["version"]}
 
+@_metrics.timed("tenants.read")
 def read(
     tenant_id: str,
     agent_id: str,
@@ -79,7 +152,7 @@ def read(
     semver: Optional[str] = None,
     fallback: Optional[Callable[[], Optional[str]]] = None,
 ) -> str:
-    """Read latest or specific semver. Optional fallback() returns a string."""
+    """Read latest or specific semver (or range like '1.2.x'). Optional fallback() returns a string."""
     pid = key(tenant_id, agent_id)
     try:
         if semver:
@@ -114,14 +187,109 @@ def ensure_initial(
     info = save(tenant_id, agent_id, text, semver=semver)
     return info["semver"]
 
-# Optional tiny cache for hot paths
-_cache: Dict[str, Dict[str, Any]] = {}
+# -------- read_cached --------
+# Bounded LRU of (store key, prompt id) -> (token, text, checked at); text None caches a
+# missing prompt. Within the revalidation window a hit skips the token() stat entirely.
+# With a store journal a hit skips it for up to the max age: writers that bypass the
+# journal are then still seen within that long.
+_read_cache = _core._LRU(int(os.environ.get("PAROLO_TENANT_CACHE", "10000")),
+                         maxbytes=int(os.environ.get("PAROLO_TENANT_CACHE_BYTES", str(64 << 20))))
+_revalidate_ns = int(float(os.environ.get("PAROLO_TENANT_REVALIDATE_MS", "0")) * 1e6)
+_max_age_ns = int(float(os.environ.get("PAROLO_TENANT_MAX_AGE_MS", "1000")) * 1e6)
+
+def configure_cache(*, maxsize: Optional[int] = None, maxbytes: Optional[int] = None,
+                    revalidate_ms: Optional[float] = None, max_age_ms: Optional[float] = None,
+                    semver_maxsize: Optional[int] = None) -> None:
+    """
+    Resize read_cached()'s LRU, set its revalidation window (0: stat on every read) and
+    how long a journal-validated entry is trusted before its token is re-checked.
+    semver_maxsize bounds the cached semver maps (one per prompt).
+    """
+    global _revalidate_ns, _max_age_ns
+    if semver_maxsize is not None:
+        _semvers.maxsize = semver_maxsize
+        _semvers.clear()
+    if maxsize is not None:
+        _read_cache.maxsize = maxsize
+    if maxbytes is not None:
+        _read_cache.maxbytes = maxbytes
+    if revalidate_ms is not None:
+        _revalidate_ns = int(revalidate_ms * 1e6)
+    if max_age_ms is not None:
+        _max_age_ns = int(max_age_ms * 1e6)
+    _read_cache.clear()
+
+def cache_info() -> Dict[str, int]:
+    return _read_cache.info()
+
+def invalidate(tenant_id: Optional[str] = None, agent_id: Optional[str] = None) -> None:
+    """Drop read_cached() entries: one tenant/agent, every agent of a tenant, or everything."""
+    if tenant_id is None:
+        _read_cache.clear()
+        _generations.clear()
+    elif agent_id is not None:
+        _read_cache.pop((_core.get_backend().key, key(tenant_id, agent_id)))
+    else:
+        prefix = key(tenant_id, "")
+        _read_cache.discard(lambda k: k[1].startswith(prefix))
+
+def _cached_text(pid: str, e: tuple) -> str:
+    if e[1] is None:
+        raise FileNotFoundError(f"{pid} not found")
+    return e[1]
+
+# store key -> (generation, checked at): with a store journal one generation check
+# validates every cached entry, and only the prompts written since are dropped
+_generations: Dict[Any, tuple] = {}
+
+def _sync_generation(store: _core.Backend, now: int) -> bool:
+    """Bring the cache up to the store's generation; False if the store tracks none."""
+    seen = _generations.get(store.key)
+    if seen is not None and _revalidate_ns and now - seen[1] < _revalidate_ns:
+        return True
+    gen = store.generation()
+    if gen is None:
+        return False
+    if seen is None or seen[0] != gen:
+        changed = store.changes_since(seen[0]) if seen is not None else None
+        if changed is None:
+            _read_cache.discard(lambda k: k[0] == store.key)
+        else:
+            gen = changed[0]
+            for name in changed[1]:
+                _read_cache.pop((store.key, name))
+    _generations[store.key] = (gen, now)
+    return True
+
+@_metrics.timed("tenants.read_cached")
 def read_cached(tenant_id: str, agent_id: str) -> str:
     pid = key(tenant_id, agent_id)
+    store = _core.get_backend()
+    ck = (store.key, pid)
+    now = time.monotonic_ns()
+    journaled = _sync_generation(store, now)
+    e = _read_cache.get(ck)
+    if e is not None and journaled and now - e[2] < _max_age_ns:
+        return _cached_text(pid, e)
+    if e is not None and _revalidate_ns and now - e[2] < _revalidate_ns:
+        return _cached_text(pid, e)
     t = prompts.token(pid)
-    e = _cache.get(pid)
-    if e and e["t"] == t:
-        return e["text"]
-    txt = prompts.read(pid)
-    _cache[pid] = {"t": t, "text": txt}
-    return txt
+    if e is not None and e[0] == t:
+        if _revalidate_ns or journaled:
+            _read_cache.put(ck, (t, e[1], now), sys.getsizeof(e[1]))
+        return _cached_text(pid, e)
+    try:
+        txt = prompts.read(pid) if t else None
+    except FileNotFoundError:
+        txt = None
+    _read_cache.put(ck, (t, txt, now), sys.getsizeof(txt))
+    return _cached_text(pid, (t, txt))
+
+@_core.on_invalidate
+def _drop_cached(name: Optional[str]) -> None:
+    if name is None:
+        _read_cache.clear()
+        _semvers.clear()
+        _generations.clear()
+    else:
+        _read_cache.pop((_core.get_backend().key, name))
@@ -0,0 +1,239 @@
+# parolo/watch.py
+"""Push-based hot reload: report changes of latest.txt instead of polling token()."""
+from __future__ import annotations
+import ctypes
+import ctypes.util
+import os
+import re
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set
+
+from . import _core
+
+class Change(NamedTuple):
+    name: str
+    token: int  # new token(name); 0 when latest.txt is gone
+
+# -------- inotify (Linux, via libc) --------
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len (+ name)
+
+_BASE_MASK = _IN_CREATE | _IN_MOVED_TO
+_PROMPT_MASK = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+
+class _Inotify:
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self.paths: Dict[int, Path] = {}
+
+    def add(self, path: Path, mask: int) -> None:
+        wd = self._add_watch(self.fd, os.fsencode(str(path)), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), str(path))
+        self.paths[wd] = path
+
+    def read(self, timeout: Optional[float]) -> List[tuple]:
+        """[(watched dir, entry name, mask)] available within timeout."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            buf = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        out, i = [], 0
+        while i < len(buf):
+            wd, mask, _cookie, size = _EVENT.unpack_from(buf, i)
+            entry = os.fsdecode(buf[i + _EVENT.size:i + _EVENT.size + size].rstrip(b"\0"))
+            i += _EVENT.size + size
+            if mask & _IN_IGNORED:
+                self.paths.pop(wd, None)
+            elif wd in self.paths:
+                out.append((self.paths[wd], entry, mask))
+        return out
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+# inotify only reports changes made through the local kernel: writes from other hosts
+# to a network or FUSE mount are never seen there, so such stores are polled instead
+_NETWORK_FS = {"nfs", "nfs4", "cifs", "smb3", "smbfs", "9p", "ceph", "glusterfs",
+               "lustre", "afs", "gpfs", "beegfs", "ocfs2", "gfs2"}
+
+def _network_fs(path: Path) -> bool:
+    """True if path lies on a network or FUSE file system (per /proc/self/mounts)."""
+    try:
+        with open("/proc/self/mounts", encoding="utf-8") as fh:
+            mounts = [line.split()[1:3] for line in fh if len(line.split()) >= 3]
+    except OSError:
+        return False
+    path = str(path.resolve())
+    best, fstype = "", ""
+    for point, kind in mounts:
+        point = re.sub(r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), point)  # "\040" = space
+        inside = path == point or path.startswith(point.rstrip("/") + "/")
+        if inside and len(point) >= len(best):  # the last mount on a point wins
+            best, fstype = point, kind
+    return fstype in _NETWORK_FS or fstype.startswith("fuse")
+
+# -------- watcher --------
+class Watcher:
+    """
+    Iterate Change events for some prompts (or every prompt of the store).
+    Uses inotify on Linux for the file store and coalesced polling elsewhere (and
+    for other backends): one generation check per poll when the store keeps a
+    journal, else token() per prompt. Each change also drops the in-process
+    caches of that prompt (_core.invalidate).
+    """
+
+    def __init__(self, names: Optional[Iterable[str]] = None, *, interval: float = 1.0,
+                 inotify: Optional[bool] = None):
+        self.store = _core.get_backend()
+        self.base: Optional[Path] = self.store.root if isinstance(self.store, _core.FileBackend) else None
+        self.names: Optional[Set[str]] = {names} if isinstance(names, str) else (
+            set(names) if names is not None else None)
+        self.interval = interval
+        self._closed = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._gen = self.store.generation()
+        self._tokens = {n: self.store.token(n) for n in self._targets()}
+        self._ino: Optional[_Inotify] = None
+        if (inotify is not False and self.base is not None and sys.platform.startswith("linux")
+                and (inotify or not _network_fs(self.base))):
+            try:
+                self._ino = _Inotify()
+                self._arm()
+            except (OSError, AttributeError):
+                if self._ino is not None:
+                    self._ino.close()
+                    self._ino = None
+                if inotify:
+                    raise
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._ino is not None else "poll"
+
+    def _targets(self) -> List[str]:
+        if self.names is not None:
+            return sorted(self.names)
+        return self.store.names()
+
+    def _arm(self) -> None:
+        self.base.mkdir(parents=True, exist_ok=True)
+        self._ino.add(self.base, _BASE_MASK)
+        for name in self._targets():
+            self._arm_prompt(name)
+
+    def _arm_prompt(self, name: str) -> None:
+        if self._ino is None:
+            return
+        try:
+            self._ino.add(self.base / name, _PROMPT_MASK)
+        except FileNotFoundError:
+            pass  # not created yet; the BASE_DIR watch reports it
+        except OSError:  # e.g. ENOSPC: the inotify watch limit is reached
+            self._fall_back_to_poll()
+
+    def _fall_back_to_poll(self) -> None:
+        self._ino.close()
+        self._ino = None
+        self._gen = None  # the first poll re-checks every prompt
+
+    def _changed_inotify(self, timeout: float) -> Set[str]:
+        events = self._ino.read(timeout)
+        if events:
+            events += self._ino.read(0)  # coalesce a burst of writes into one pass
+        names: Set[str] = set()
+        for path, entry, mask in events:
+            if path == self.base:
+                if mask & _IN_ISDIR and (self.names is None or entry in self.names):
+                    self._arm_prompt(entry)
+                    names.add(entry)
+            elif entry == "latest.txt":
+                names.add(path.name)
+        return names
+
+    def _changed_poll(self) -> Set[str]:
+        """Prompts to re-check: those in the store journal since the last poll, else all."""
+        gen = self.store.generation()
+        if gen is not None and gen == self._gen:
+            return set()
+        changed = self.store.changes_since(self._gen) if gen is not None and self._gen is not None else None
+        if changed is None:
+            self._gen = gen
+            return set(self._targets()) | set(self._tokens)
+        self._gen = changed[0]
+        return {n for n in changed[1] if self.names is None or n in self.names}
+
+    def poll(self, timeout: Optional[float] = None) -> List[Change]:
+        """Wait up to timeout (default: interval) and return the changes seen."""
+        timeout = self.interval if timeout is None else timeout
+        if self._ino is not None:
+            candidates = self._changed_inotify(timeout)
+        else:
+            self._closed.wait(timeout)
+            candidates = self._changed_poll()
+        out: List[Change] = []
+        for name in sorted(candidates):
+            t = self.store.token(name)
+            if t != self._tokens.get(name, 0):
+                self._tokens[name] = t
+                _core.invalidate(name)
+                out.append(Change(name, t))
+        return out
+
+    def __iter__(self) -> Iterator[Change]:
+        while not self._closed.is_set():
+            yield from self.poll()
+
+    def start(self, callback: Callable[[Change], None]) -> "Watcher":
+        """Deliver changes to callback(change) from a daemon thread."""
+        def run():
+            for change in self:
+                callback(change)
+        self._thread = threading.Thread(target=run, name="parolo-watch", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(self.interval + 1.0)
+        if self._ino is not None:
+            self._ino.close()
+            self._ino = None
+
+    def __enter__(self) -> "Watcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+def watch(
+    names: Optional[Iterable[str]] = None,
+    callback: Optional[Callable[[Change], None]] = None,
+    *,
+    interval: float = 1.0,
+    inotify: Optional[bool] = None,
+) -> Watcher:
+    """Watch one prompt, a set of prompts, or the whole store (names=None)."""
+    w = Watcher(names, interval=interval, inotify=inotify)
+    return w.start(callback) if callback else w
@@ -0,0 +1,72 @@
+# tests/test_aio.py
+import asyncio
+import threading
+import time
+import pytest
+
+try:
+    from parolo import aio, prompts
+    import parolo._core as core
+except Exception:
+    pytest.skip("parolo.aio not available", allow_module_level=True)
+
+pytest.importorskip("jinja2")
+
+
+def test_async_save_read_render(tmp_path):
+    prompts.set_base_dir(tmp_path)
+
+    async def main():
+        info = await aio.save("greet", "Hello {{ name }}!")
+        assert info["version"] == "v0001"
+        assert await aio.read("greet") == "Hello {{ name }}!"
+        assert await aio.render("greet", name="Ada") == "Hello Ada!"
+        assert await aio.prompts.render_version("greet", "v0001", name="Bob") == "Hello Bob!"
+        await aio.save("bye", "Bye")
+        assert await aio.read_many(["greet", "bye", "greet"]) == {"greet": "Hello {{ name }}!", "bye": "Bye"}
+
+        await aio.tenants.save("t", "a", "T1", semver="1.0.0")
+        assert await aio.tenants.read("t", "a", semver="1.0.0") == "T1"
+        assert await aio.tenants.read_cached("t", "a") == "T1"
+
+    asyncio.run(main())
+
+
+def test_concurrent_reads_are_coalesced(tmp_path, monkeypatch):
+    prompts.set_base_dir(tmp_path)
+    prompts.save("hot", "H")
+    calls = []
+    lock = threading.Lock()
+    real_get = core.get
+
+    def slow_get(name):
+        with lock:
+            calls.append(name)
+        time.sleep(0.05)
+        return real_get(name)
+
+    monkeypatch.setattr(core, "get", slow_get)
+
+    async def main():
+        return await asyncio.gather(*(aio.read("hot") for _ in range(20)))
+
+    assert asyncio.run(main()) == ["H"] * 20
+    assert calls == ["hot"]
+
+
+def test_renders_share_only_identically_typed_contexts(tmp_path, monkeypatch):
+    prompts.set_base_dir(tmp_path)
+    prompts.save("p", "{{ x }}")
+    real_render = core.render
+
+    def slow_render(name, **ctx):
+        time.sleep(0.05)
+        return real_render(name, **ctx)
+
+    monkeypatch.setattr(core, "render", slow_render)
+    values = [1, True, 1.0, (1,), (True,), {"a": 1}, {"a": True}, [1.0]]
+
+    async def main():
+        return await asyncio.gather(*(aio.render("p", x=v) for v in values))
+
+    assert asyncio.run(main()) == [str(v) for v in values]
@@ -0,0 +1,54 @@
+# tests/test_blobs.py
+import os
+import pytest
+
+try:
+    from parolo import prompts, tenants, Prompt
+except Exception:
+    pytest.skip("prompts namespace not available", allow_module_level=True)
+
+
+@pytest.fixture
+def blobs(tmp_path):
+    prompts.set_base_dir(tmp_path)
+    prompts.use_blobs(True)
+    yield tmp_path
+    prompts.use_blobs(False)
+
+
+def test_identical_texts_share_one_blob(blobs):
+    for t in ("a", "b", "c"):
+        tenants.save(t, "bot", "Shared system prompt")
+    tenants.save("a", "bot", "Changed")
+
+    files = [blobs / f"{t}_bot" / "latest.txt" for t in "bc"]
+    files += [blobs / f"{t}_bot" / "versions" / "v0001.txt" for t in "abc"]
+    assert len({f.stat().st_ino for f in files}) == 1
+    assert len(list((blobs / ".blobs").glob("*/*"))) == 2
+
+    assert prompts.read("a_bot") == "Changed"
+    assert prompts.read_version("a_bot", "v0001") == "Shared system prompt"
+    assert {p["name"] for p in prompts.list()} == {"a_bot", "b_bot", "c_bot"}
+
+    # legacy writer replaces latest.txt instead of writing through the shared inode
+    Prompt.set_base_dir(blobs)
+    Prompt.create("b_bot", "Legacy edit")
+    assert prompts.read("c_bot") == "Shared system prompt"
+
+
+def test_migrate_and_gc(tmp_path):
+    prompts.set_base_dir(tmp_path)
+    prompts.save("x", "same")
+    prompts.save("y", "same")
+    assert (tmp_path / "x" / "latest.txt").stat().st_ino != (tmp_path / "y" / "latest.txt").stat().st_ino
+
+    stats = prompts.migrate_blobs()
+    assert stats["files"] == 4 and stats["linked"] == 3
+    assert prompts.migrate_blobs()["linked"] == 0
+    inodes = {os.stat(p).st_ino for p in tmp_path.glob("*/latest.txt")}
+    assert len(inodes) == 1
+    assert prompts.read_version("y", "v0001") == "same"
+
+    for p in [*tmp_path.glob("[xy]/latest.txt"), *tmp_path.glob("[xy]/versions/v*.txt")]:
+        p.unlink()
+    assert prompts.gc_blobs() == 1
@@ -0,0 +1,78 @@
+# tests/test_bulk.py
+import pytest
+
+try:
+    from parolo import prompts
+except Exception:
+    pytest.skip("prompts namespace not available", allow_module_level=True)
+
+pytest.importorskip("jinja2")
+
+
+def test_save_many_matches_put(tmp_path):
+    prompts.set_base_dir(tmp_path)
+    prompts.save("a", "A0")
+
+    infos = prompts.save_many([
+        ("a", "A1"),
+        ("b", "B1", {"owner": "x"}),
+        {"name": "a", "text": "A1"},          # unchanged: no new version
+        {"name": "a", "text": "A2", "metadata": {"k": 1}},
+    ])
+    assert [i["version"] for i in infos] == ["v0002", "v0001", "v0002", "v0003"]
+    assert prompts.read("a") == "A2"
+    assert prompts.versions("a") == ["v0001.txt", "v0002.txt", "v0003.txt"]
+    assert prompts.meta("a", "v0003")["previous_hash"] == infos[0]["hash"]
+    assert prompts.meta("b", "v0001")["metadata"] == {"owner": "x"}
+    # head record is consistent with single saves afterwards
+    assert prompts.save("a", "A2")["version"] == "v0003"
+    assert prompts.save_many([("b", "B1")], fsync=True)[0]["version"] == "v0001"
+
+
+def test_read_many(tmp_path):
+    prompts.set_base_dir(tmp_path)
+    prompts.save_many([("x", "X"), ("y", "Y")])
+    assert prompts.read_many(["y", "x"]) == {"y": "Y", "x": "X"}
+    assert prompts.read_many(["x", "nope"], skip_missing=True) == {"x": "X"}
+    with pytest.raises(FileNotFoundError):
+        prompts.read_many(["nope"])
+
+
+@pytest.mark.parametrize("processes", [False, True])
+def test_render_many(tmp_path, processes):
+    prompts.set_base_dir(tmp_path)
+    prompts.save("r", "{{ i }}-{{ s }}")
+    ctxs = ({"i": i, "s": "x"} for i in range(300))
+    out = list(prompts.render_many("r", ctxs, workers=2, processes=processes, chunksize=16))
+    assert out == [f"{i}-x" for i in range(300)]
+
+    unordered = prompts.render_many("r", [{"i": i, "s": "y"} for i in range(50)], ordered=False, chunksize=7)
+    assert sorted(unordered) == [(i, f"{i}-y") for i in range(50)]
+
+
+def test_render_many_spawned_workers_use_caller_store(tmp_path):
+    import multiprocessing
+    prompts.set_base_dir(tmp_path)
+    prompts.save("greet", "Hi {{ name }}")
+    prompts.save("card", "{% include 'greet' %}!")
+    ctx = multiprocessing.get_context("spawn")
+    prompts.use_composition(allow=["greet"])
+    try:
+        out = list(prompts.render_many("card", [{"name": "Ada"}, {"name": "Bo"}], workers=1,
+                                       processes=True, mp_context=ctx))
+    finally:
+        prompts.use_composition(False)
+    assert out == ["Hi Ada!", "Hi Bo!"]
+    assert list((tmp_path / ".jinja").rglob("*.code"))  # the caller's code cache, not ~/.parolo
+
+
+def test_render_many_rejects_unpicklable_rule_for_spawn(tmp_path):
+    import multiprocessing
+    prompts.set_base_dir(tmp_path)
+    prompts.save("r", "{{ i }}")
+    prompts.use_composition(allow=lambda name: True)
+    try:
+        with pytest.raises(TypeError, match="module-level function"):
+            prompts.render_many("r", [{"i": 1}], processes=True, mp_context=multiprocessing.get_context("spawn"))
+    finally:
+        prompts.use_composition(False)
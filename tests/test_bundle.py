@@ -0,0 +1,56 @@
+# tests/test_bundle.py
+import pytest
+
+try:
+    from parolo import prompts, tenants
+except Exception:
+    pytest.skip("prompts namespace not available", allow_module_level=True)
+
+pytest.importorskip("jinja2")
+
+
+@pytest.fixture
+def store(tmp_path):
+    prompts.set_base_dir(tmp_path / "store")
+    prompts.save("greet", "Hello {{ name }}!")
+    prompts.save("greet", "Hi {{ name }}!")
+    prompts.save("copy", "Hi {{ name }}!")
+    tenants.save("acme", "bot", "A", semver="1.0.0")
+    tenants.save("acme", "bot", "B", semver="1.1.0")
+    yield tmp_path
+    prompts.close_bundle()
+
+
+def test_bundle_serves_read_api(store):
+    path = store / "prompts.bundle"
+    stats = prompts.export_bundle(path, versions=True)
+    assert stats["prompts"] == 3
+    assert stats["texts"] < 8  # identical texts are stored once
+
+    prompts.set_base_dir(store / "empty")  # prove nothing is read from disk
+    prompts.open_bundle(path)
+    assert prompts.read("greet") == "Hi {{ name }}!"
+    assert prompts.read_version("greet", "v0001.txt") == "Hello {{ name }}!"
+    assert prompts.render("greet", name="Ada") == "Hi Ada!"
+    assert prompts.versions("greet") == ["v0001.txt", "v0002.txt"]
+    assert prompts.meta("acme_bot", "v0002")["metadata"]["semver"] == "1.1.0"
+    assert [p["name"] for p in prompts.list()] == ["acme_bot", "copy", "greet"]
+    assert prompts.token("greet") != 0 and prompts.token("nope") == 0
+
+    assert tenants.read("acme", "bot", semver="1.0.0") == "A"
+    assert tenants.read("acme", "bot", semver="1.x") == "B"
+    assert tenants.read_cached("acme", "bot") == "B"
+    with pytest.raises(PermissionError):
+        prompts.save("greet", "changed")
+    assert not (store / "empty").exists()
+
+
+def test_bundle_without_versions(store):
+    path = store / "latest.bundle"
+    prompts.export_bundle(path)
+    prompts.open_bundle(path)
+    assert prompts.read("copy") == "Hi {{ name }}!"
+    with pytest.raises(FileNotFoundError):
+        prompts.read_version("greet", "v0001")
+    prompts.close_bundle()
+    assert prompts.read_version("greet", "v0001") == "Hello {{ name }}!"
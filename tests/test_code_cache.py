@@ -0,0 +1,52 @@
+# tests/test_code_cache.py
+import pytest
+
+try:
+    from parolo import prompts
+    from parolo import _core
+except Exception:
+    pytest.skip("prompts namespace not available", allow_module_level=True)
+
+pytest.importorskip("jinja2")
+
+
+def test_precompile_and_load_from_disk(tmp_path, monkeypatch):
+    prompts.set_base_dir(tmp_path)
+    prompts.save("a", "Hi {{ name }}")
+    prompts.save("b", "{% for x in xs %}{{ x }},{% endfor %}")
+    prompts.save("broken", "{% if %}")
+
+    codes = tmp_path / ".jinja"
+    assert prompts.precompile() == {"compiled": 2, "cached": 0, "errors": 1}
+    assert prompts.precompile(["a"]) == {"compiled": 0, "cached": 1, "errors": 0}
+    assert len(list(codes.rglob("*.code"))) == 2
+    assert prompts.list()[0]["name"] == "a"  # the cache dir is not a prompt
+
+    # a fresh process only loads code: compiling is not needed
+    prompts.cache_clear()
+    monkeypatch.setattr(_core._jinja(), "compile", lambda *a, **k: pytest.fail("compiled"))
+    assert prompts.render("a", name="Ada") == "Hi Ada"
+    assert prompts.render("b", xs=[1, 2]) == "1,2,"
+    monkeypatch.undo()
+
+    # unreadable cache files are recompiled and replaced
+    path = _core._code_path("Hi {{ name }}")
+    path.write_bytes(b"garbage")
+    prompts.cache_clear()
+    assert prompts.render("a", name="Bo") == "Hi Bo"
+    assert path.read_bytes() != b"garbage"
+
+
+def test_code_cache_directory_and_off(tmp_path):
+    prompts.set_base_dir(tmp_path / "store")
+    try:
+        prompts.use_code_cache(tmp_path / "codes")
+        prompts.save("p", "X {{ y }}")
+        assert prompts.render("p", y=1) == "X 1"
+        assert list((tmp_path / "codes").rglob("*.code"))
+        prompts.use_code_cache(False)
+        with pytest.raises(RuntimeError):
+            prompts.precompile()
+    finally:
+        prompts.use_code_cache(True)
+    assert not (tmp_path / "store" / ".jinja").exists()
@@ -0,0 +1,88 @@
+# tests/test_compose.py
+import pytest
+
+try:
+    from parolo import prompts, MissingVariablesError
+    from parolo.memory_store import MemoryBackend
+except Exception:
+    pytest.skip("prompts namespace not available", allow_module_level=True)
+
+pytest.importorskip("jinja2")
+
+
+@pytest.fixture(autouse=True)
+def composition():
+    prompts.use_composition()
+    yield
+    prompts.use_composition(False)
+
+
+def test_include_extends_and_pinned_versions(tmp_path):
+    prompts.set_base_dir(tmp_path)
+    prompts.cache_clear()
+    prompts.save("system", "You are {{ persona }}.")
+    prompts.save("system", "You are {{ persona }}, be brief.")
+    prompts.save("base", "{% block head %}{% include 'system' %}{% endblock %} | {% block body %}{% endblock %}")
+    prompts.save("task", "{% extends 'base' %}{% block body %}Do {{ job }}.{% endblock %}")
+    prompts.save("pinned", "{% include 'system@v0001' %} / {{ job }}")
+
+    assert prompts.render("task", persona="Ada", job="x") == "You are Ada, be brief. | Do x."
+    assert prompts.render("pinned", persona="Ada", job="x") == "You are Ada. / x"
+    assert prompts.dependencies("task") == ["base", "system"]
+    assert prompts.meta("task", "v0001")["jinja_includes"] == ["base"]
+    assert prompts.vars("task") == ["job", "persona"]
+    with pytest.raises(MissingVariablesError) as e:
+        prompts.render_checked("task", {"job": "x"})
+    assert e.value.missing == ["persona"]
+
+    # a changed dependency is picked up; the composite itself is not recompiled
+    compiled = prompts.cache_info()["misses"]
+    prompts.save("system", "You are {{ persona }}!")
+    assert prompts.render("task", persona="Bo", job="y") == "You are Bo! | Do y."
+    assert prompts.render("pinned", persona="Bo", job="y") == "You are Bo. / y"
+    assert prompts.cache_info()["misses"] == compiled
+
+    from jinja2 import TemplateNotFound
+    prompts.save("broken", "{% include 'nope' %}")
+    with pytest.raises(TemplateNotFound):
+        prompts.render("broken")
+
+
+def test_includes_follow_the_active_backend(tmp_path):
+    prompts.set_base_dir(tmp_path)
+    prompts.save("part", "file")
+    prompts.save("whole", "[{% include 'part' %}]")
+    assert prompts.render("whole") == "[file]"
+    try:
+        prompts.use_backend(MemoryBackend())
+        prompts.save("part", "memory")
+        prompts.save("whole", "[{% include 'part' %}]")
+        assert prompts.render("whole") == "[memory]"
+    finally:
+        prompts.use_backend(None)
+    assert prompts.render("whole") == "[file]"
+
+
+def test_composition_is_opt_in_and_scoped(tmp_path):
+    from jinja2 import TemplateNotFound
+    prompts.set_base_dir(tmp_path)
+    prompts.save("acme_system", "acme")
+    prompts.save("globex_secret", "globex")
+    prompts.save("acme_task", "[{% include 'acme_system' %}]")
+    prompts.save("acme_leak", "[{% include 'globex_secret' %}]")
+    assert prompts.render("acme_leak") == "[globex]"
+
+    prompts.use_composition(False)
+    with pytest.raises(TemplateNotFound):
+        prompts.render("acme_task")
+
+    prompts.use_composition(allow=["acme_"])
+    assert prompts.render("acme_task") == "[acme]"
+    with pytest.raises(TemplateNotFound):
+        prompts.render("acme_leak")
+
+    prompts.use_composition()
+    for ref in ["../acme_system", "acme_system/../globex_secret", ".jinja", "a\\\\b"]:
+        prompts.save("bad", "{% include '" + ref + "' %}")
+        with pytest.raises(TemplateNotFound):
+            prompts.render("bad")
@@ -0,0 +1,53 @@
+# tests/test_compression.py
+import pytest
+
+try:
+    from parolo import prompts, Prompt
+    from parolo import _core
+except Exception:
+    pytest.skip("prompts namespace not available", allow_module_level=True)
+
+pytest.importorskip("jinja2")
+
+
+@pytest.fixture
+def compressed(tmp_path):
+    prompts.set_base_dir(tmp_path)
+    prompts.use_compression("zlib", min_size=1024)
+    yield tmp_path
+    prompts.use_compression(None)
+    prompts.use_deltas(0)
+
+
+def test_large_versions_compressed_transparently(compressed):
+    big = "Dear {{ name }},\n" + "please read the attached terms carefully.\n" * 200
+    prompts.save("p", "short {{ name }}")
+    prompts.save("p", big)
+
+    vdir = compressed / "p" / "versions"
+    assert (vdir / "v0001.txt").read_text() == "short {{ name }}"  # below the threshold
+    raw = (vdir / "v0002.txt").read_bytes()
+    assert raw.startswith(b"\0parolo-zlib\n") and len(raw) < len(big) // 10
+    assert (compressed / "p" / "latest.txt").read_text() == big
+
+    assert prompts.read_version("p", "v0002") == big
+    assert prompts.render_version("p", "v0002", name="Ada").startswith("Dear Ada,")
+    m = prompts.versions("p", with_meta=True)[-1]
+    assert m["hash"] == _core._sha256(big) and m["size"] == len(big)
+    assert prompts.meta("p", "v0002")["previous_hash"] == _core._sha256("short {{ name }}")
+    assert prompts.save("p", big)["version"] == "v0002"
+    Prompt.set_base_dir(compressed)
+    assert Prompt.get_prompt("p", "v0002") == big
+
+    # mixed with deltas, every version still decodes, also from the pack
+    prompts.use_deltas(8)
+    for i in range(3):
+        prompts.save("p", big + f"signed {i}\n" * 40)
+    prompts.pack("p", keep=0)
+    prompts.invalidate()
+    assert prompts.read_version("p", "v0005") == big + "signed 2\n" * 40
+
+
+def test_unknown_codec_rejected(compressed):
+    with pytest.raises(ValueError):
+        prompts.use_compression("lz4")
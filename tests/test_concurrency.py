@@ -0,0 +1,46 @@
+# tests/test_concurrency.py
+import multiprocessing as mp
+import threading
+import pytest
+
+try:
+    from parolo import prompts
+except Exception:
+    pytest.skip("prompts namespace not available", allow_module_level=True)
+
+
+def _writer(base, worker, n):
+    prompts.set_base_dir(base)
+    for i in range(n):
+        prompts.save("shared", f"worker {worker} edit {i}")
+
+
+def _check(base, total):
+    prompts.set_base_dir(base)
+    vers = prompts.versions("shared", with_meta=True)
+    assert [v["version"] for v in vers] == [f"v{i:04d}" for i in range(1, total + 1)]
+    texts = {prompts.read_version("shared", v["version"]) for v in vers}
+    assert len(texts) == total  # nothing overwritten
+    for prev, cur in zip(vers, vers[1:]):
+        assert prompts.meta("shared", cur["version"])["previous_hash"] == prev["hash"]
+
+
+def test_threads_never_share_a_version(tmp_path):
+    ts = [threading.Thread(target=_writer, args=(tmp_path, w, 25)) for w in range(4)]
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    _check(tmp_path, 100)
+
+
+@pytest.mark.skipif("fork" not in mp.get_all_start_methods(), reason="needs fork")
+def test_processes_never_share_a_version(tmp_path):
+    ctx = mp.get_context("fork")
+    ps = [ctx.Process(target=_writer, args=(tmp_path, w, 25)) for w in range(4)]
+    for p in ps:
+        p.start()
+    for p in ps:
+        p.join()
+        assert p.exitcode == 0
+    _check(tmp_path, 100)
@@ -0,0 +1,65 @@
+# tests/test_delta.py
+import pytest
+
+try:
+    from parolo import prompts, Prompt
+    from parolo import _core
+except Exception:
+    pytest.skip("prompts namespace not available", allow_module_level=True)
+
+
+@pytest.fixture
+def deltas(tmp_path):
+    prompts.set_base_dir(tmp_path)
+    prompts.use_deltas(4)
+    yield tmp_path
+    prompts.use_deltas(0)
+
+
+def _texts(n):
+    body = "".join(f"line {i}: some fairly long prompt text that repeats\n" for i in range(40))
+    return [body + f"tail {k}\n" for k in range(1, n + 1)]
+
+
+def test_versions_stored_as_deltas_with_checkpoints(deltas):
+    texts = _texts(9)
+    for t in texts[:5]:
+        prompts.save("p", t, metadata={"k": 1})
+    prompts.save_many([("p", t) for t in texts[5:]])
+
+    vdir = deltas / "p" / "versions"
+    kinds = [(vdir / f"v{i:04d}.txt").read_bytes().startswith(_core.DELTA_MAGIC) for i in range(1, 10)]
+    assert kinds == [False, True, True, True, False, True, True, True, False]
+    assert (deltas / "p" / "latest.txt").read_text() == texts[-1]
+
+    prompts.invalidate()  # reconstruct from disk, not from the write-through cache
+    for i, t in enumerate(texts, 1):
+        assert prompts.read_version("p", f"v{i:04d}") == t
+    assert prompts.version_cache_info()["size"] > 0
+    assert prompts.meta("p", "v0003")["hash"] == _core._sha256(texts[2])
+    assert prompts.save("p", texts[-1])["version"] == "v0009"  # unchanged
+
+    # packed deltas and the legacy class API decode the same way
+    prompts.pack("p", keep=1)
+    prompts.invalidate()
+    assert prompts.read_version("p", "v0008") == texts[7]
+    Prompt.set_base_dir(deltas)
+    assert Prompt.get_prompt("p", "v0004.txt") == texts[3]
+
+
+def test_small_changes_stay_full_text(deltas):
+    prompts.save("q", "a")
+    prompts.save("q", "b")
+    assert (deltas / "q" / "versions" / "v0002.txt").read_text() == "b"
+
+
+def test_crlf_texts_read_the_same_with_deltas(deltas):
+    texts = [t.replace("\n", "\r\n") for t in _texts(3)]
+    for t in texts:
+        prompts.save("d", t)
+    assert (deltas / "d" / "versions" / "v0002.txt").read_bytes().startswith(_core.DELTA_MAGIC)
+    want = [t.replace("\r\n", "\n") for t in texts]
+    assert prompts.read("d") == want[-1]
+    assert [prompts.read_version("d", f"v000{i}") for i in (1, 2, 3)] == want  # write-through cache
+    prompts.invalidate()
+    assert [prompts.read_version("d", f"v000{i}") for i in (1, 2, 3)] == want
@@ -0,0 +1,35 @@
+# tests/test_lazy_import.py
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _run(code):
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return out.stdout.split()
+
+
+def test_import_parolo_defers_heavy_modules():
+    loaded = _run("import sys, parolo; print(*[m for m in ('jinja2', 'parolo.tenants', 'parolo.watch',"
+                  " 'parolo.bundle', 'concurrent.futures') if m in sys.modules])")
+    assert loaded == []
+
+
+def test_lazy_facades_resolve_on_first_use(tmp_path):
+    loaded = _run(
+        "import sys, parolo\n"
+        f"parolo.prompts.set_base_dir({str(tmp_path)!r})\n"
+        "parolo.prompts.save('p', 'x')\n"
+        "print(parolo.prompts.read('p'), 'parolo.tenants' in sys.modules)\n"
+        "print(parolo.tenants.key('a', 'b'), type(parolo.tenants).__name__, callable(parolo.prompts.watch))\n"
+    )
+    assert loaded == ["x", "False", "a_b", "SimpleNamespace", "True"]
+
+
+def test_unreadable_bundle_fails_import(tmp_path):
+    env = {**os.environ, "PAROLO_BUNDLE": str(tmp_path / "missing.bundle")}
+    out = subprocess.run([sys.executable, "-c", "import parolo"], cwd=ROOT, capture_output=True, text=True, env=env)
+    assert out.returncode != 0 and "FileNotFoundError" in out.stderr and "PAROLO_BUNDLE" in out.stderr
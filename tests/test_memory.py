@@ -0,0 +1,68 @@
+# tests/test_memory.py
+import pytest
+
+try:
+    from parolo import prompts, tenants
+    from parolo._core import FileBackend
+    from parolo.memory_store import MemoryBackend
+except Exception:
+    pytest.skip("prompts namespace not available", allow_module_level=True)
+
+pytest.importorskip("jinja2")
+
+
+@pytest.fixture
+def restore():
+    yield
+    prompts.use_backend(None)
+
+
+def test_memory_store_matches_file_store(tmp_path, restore):
+    def run():
+        out = [prompts.save("p", "Hello {{ name }}!", metadata={"k": [1]}),
+               prompts.save("p", "Hello {{ name }}!"),
+               prompts.save("p", "Hi {{ name }}!\nBye")]
+        out += [prompts.versions("p", with_meta=True), prompts.meta("p", "v0001"),
+                prompts.read("p"), prompts.read_version("p", "v0001.txt"),
+                prompts.render("p", name="Ada"), prompts.list(), prompts.token("nope")]
+        for o in out:  # timestamps differ between runs
+            for m in (o if isinstance(o, list) else [o]):
+                if isinstance(m, dict):
+                    m.pop("timestamp", None)
+        return out
+
+    prompts.set_base_dir(tmp_path)
+    on_disk = run()
+    prompts.use_backend(MemoryBackend())
+    assert run() == on_disk
+    assert prompts.token("p") > 0
+
+    tenants.save("acme", "bot", "A", semver="1.0.0")
+    assert tenants.read("acme", "bot", semver="1.0.0") == "A"
+    # nothing persisted
+    assert sorted(p.name for p in tmp_path.iterdir() if not p.name.startswith(".")) == ["p"]
+
+
+def test_memory_read_through_cache(tmp_path, restore):
+    prompts.set_base_dir(tmp_path)
+    prompts.save("p", "one")
+    files = FileBackend(tmp_path)
+    mem = prompts.use_backend(MemoryBackend(files))
+
+    assert prompts.read("p") == "one"
+    (tmp_path / "p" / "latest.txt").unlink()  # served from memory only while unchanged
+    with pytest.raises(FileNotFoundError):
+        prompts.read("p")
+
+    files.put("p", "two")  # another writer, behind the cache's back
+    assert prompts.read("p") == "two"
+    assert prompts.versions("p") == ["v0001.txt", "v0002.txt"]
+    assert prompts.save("p", "three")["version"] == "v0003"  # writes go through
+    assert files.get("p") == "three" and prompts.read("p") == "three"
+    assert prompts.read_version("p", "v0001") == "one"
+    mem.clear()
+    assert prompts.read("p") == "three"
+    assert prompts.versions("nope") == []
+
+    home = FileBackend("~/parolo-test-store")
+    assert "~" not in str(home.root) and home.root.is_absolute()
@@ -0,0 +1,58 @@
+# tests/test_metrics.py
+import pytest
+
+try:
+    from parolo import Prompt, prompts, tenants
+    from parolo import metrics
+except Exception:
+    pytest.skip("prompts namespace not available", allow_module_level=True)
+
+pytest.importorskip("jinja2")
+
+
+@pytest.fixture
+def instrumented():
+    metrics.reset()
+    prompts.instrument(True)
+    yield
+    prompts.instrument(False)
+    metrics.reset()
+
+
+def test_stats_counts_io_compiles_and_latency(tmp_path, instrumented):
+    prompts.set_base_dir(tmp_path)
+    prompts.cache_clear()
+    seen = []
+    tracer = prompts.trace(lambda op, seconds, error: seen.append((op, error is None)))
+    try:
+        prompts.save("p", "Hi {{ name }}")
+        assert prompts.render("p", name="A") == "Hi A"
+        assert prompts.render("p", name="B") == "Hi B"  # compiled once
+        prompts.versions("p", with_meta=True)
+        with pytest.raises(FileNotFoundError):
+            prompts.read("nope")
+        tenants.save("t", "a", "T", semver="1.0.0")
+        Prompt.set_base_dir(tmp_path)
+        Prompt.get_prompt("p")
+    finally:
+        metrics.remove_tracer(tracer)
+
+    s = prompts.stats()
+    assert s["enabled"] is True
+    c = s["counters"]
+    assert c["template_compiles"] == 1
+    assert c["files_opened"] >= 2 and c["bytes_read"] > 0 and c["json_parses"] >= 1
+    assert c["read.errors"] == 1
+    assert s["ops"]["render"]["count"] == 2 and s["ops"]["render"]["p50_us"] > 0
+    assert {"save", "versions", "tenants.save", "Prompt.get_prompt"} <= set(s["ops"])
+    assert s["caches"]["templates"]["hits"] >= 1
+    assert ("read", False) in seen and ("render", True) in seen
+
+
+def test_disabled_records_nothing(tmp_path):
+    metrics.reset()
+    prompts.set_base_dir(tmp_path)
+    prompts.save("p", "x")
+    prompts.read("p")
+    s = prompts.stats()
+    assert s["enabled"] is False and s["counters"] == {} and s["ops"] == {}
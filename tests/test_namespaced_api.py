@@ -1,4 +1,5 @@
 # tests/test_namespaced_api.py
+import json
 import pytest
 
 try:
@@ -33,3 +34,119 @@ def test_prompts_list_and_meta(tmp_path, monkeypatch):
     assert len(vers) == 2
     assert "timestamp" in vers[-1]
     assert "hash" in vers[-1]
+
+def test_render_uses_template_cache(tmp_path):
+    prompts.set_base_dir(tmp_path)
+    prompts.cache_clear()
+
+    prompts.save("cached", "Hi {{ who }}")
+    assert prompts.render("cached", who="a") == "Hi a"
+    assert prompts.render("cached", who="b") == "Hi b"
+    info = prompts.cache_info()
+    assert (info["hits"], info["misses"]) == (1, 1)
+
+    # a new save changes the stamp, so the next render recompiles
+    prompts.save("cached", "Bye {{ who }}")
+    assert prompts.render("cached", who="c") == "Bye c"
+    assert prompts.render_version("cached", "v0001", who="d") == "Hi d"
+    assert prompts.render_version("cached", "v0001.txt", who="e") == "Hi e"
+    assert prompts.cache_info()["misses"] == 3
+
+def test_template_cache_evicts(tmp_path):
+    prompts.set_base_dir(tmp_path)
+    prompts.cache_clear(maxsize=2)
+    try:
+        for n in "abc":
+            prompts.save(n, n)
+            prompts.render(n)
+        info = prompts.cache_info()
+        assert info["size"] == 2 and info["evictions"] == 1
+    finally:
+        prompts.cache_clear(maxsize=256)
+
+def test_versions_served_from_index(tmp_path):
+    prompts.set_base_dir(tmp_path)
+
+    prompts.save("idx", "one {{ a }}", metadata={"owner": "x"})
+    prompts.save("idx", "two {{ b }}")
+    index = tmp_path / "idx" / "versions" / "index.jsonl"
+    assert len(index.read_text().splitlines()) == 2
+
+    vers = prompts.versions("idx", with_meta=True)
+    assert [v["version"] for v in vers] == ["v0001", "v0002"]
+    assert vers[0]["metadata"] == {"owner": "x"}
+    assert vers[1]["jinja_variables"] == ["b"]
+    assert prompts.meta("idx", "v0001.txt")["previous_hash"] is None
+    # results are the caller's: mutating them leaves the cached index alone
+    vers[0]["metadata"]["owner"] = "MUTATED"
+    vers[1]["jinja_variables"].append("z")
+    m = prompts.meta("idx", "v0002")
+    m["jinja_variables"].clear()
+    assert prompts.meta("idx", "v0001")["metadata"] == {"owner": "x"}
+    assert prompts.versions("idx", with_meta=True)[1]["jinja_variables"] == ["b"]
+
+    # a lost index is recovered from the vNNNN.json files
+    index.unlink()
+    assert prompts.versions("idx") == ["v0001.txt", "v0002.txt"]
+    assert index.exists()
+    assert prompts.rebuild_index("idx") == 2
+
+def test_index_catches_up_with_legacy_writes(tmp_path):
+    from parolo import Prompt
+    prompts.set_base_dir(tmp_path)
+    Prompt.set_base_dir(tmp_path)
+
+    prompts.save("mixed", "A")
+    prompts.versions("mixed")
+    Prompt.create("mixed", "B")
+    assert prompts.versions("mixed") == ["v0001.txt", "v0002.txt"]
+    assert prompts.list()[0]["latest_version"] == "v0002"
+
+def test_put_uses_head_record(tmp_path):
+    prompts.set_base_dir(tmp_path)
+
+    prompts.save("h", "one")
+    info = prompts.save("h", "two")
+    head = tmp_path / "h" / "versions" / "head.json"
+    latest = tmp_path / "h" / "latest.txt"
+    st = latest.stat()
+    assert json.loads(head.read_text()) == {"version": "v0002", "hash": info["hash"],
+                                            "latest": [st.st_mtime_ns, st.st_size, st.st_ino]}
+
+    # unchanged save: no new version, latest.txt left alone
+    before = latest.stat().st_ino
+    assert prompts.save("h", "two")["version"] == "v0002"
+    assert latest.stat().st_ino == before
+
+    # latest.txt deleted, or left with another text by a torn save: an unchanged save restores it
+    latest.unlink()
+    assert prompts.save("h", "two")["version"] == "v0002"
+    assert prompts.read("h") == "two"
+    latest.write_text("half-saved")
+    assert prompts.save("h", "two")["version"] == "v0002"
+    assert prompts.read("h") == "two"
+    assert prompts.save_many([("h", "two")])[0]["version"] == "v0002"
+
+    # a missing head record is recovered from the index
+    head.unlink()
+    assert prompts.save("h", "three")["version"] == "v0003"
+    assert prompts.meta("h", "v0003")["previous_hash"] == info["hash"]
+
+def test_store_generation_and_journal(tmp_path):
+    from parolo import Prompt, _core
+    prompts.set_base_dir(tmp_path)
+    assert _core.generation() is None  # no journal yet
+
+    prompts.save("a", "one")
+    g1 = _core.generation()
+    prompts.save("a", "one")  # unchanged: no write, no bump
+    assert _core.generation() == g1
+    prompts.save_many([("b", "x"), ("c", "y")])
+    Prompt.set_base_dir(tmp_path)
+    Prompt.create("d", "legacy")
+    g2, changed = _core.changes_since(g1)
+    assert changed == {"b", "c", "d"} and g2 == _core.generation()
+    assert _core.changes_since(g2) == (g2, set())
+
+    _core.compact_journal()
+    assert _core.changes_since(g2) is None  # new journal: re-check everything
@@ -0,0 +1,37 @@
+# tests/test_pack.py
+import pytest
+
+try:
+    from parolo import prompts
+except Exception:
+    pytest.skip("prompts namespace not available", allow_module_level=True)
+
+
+def test_pack_moves_cold_versions(tmp_path):
+    prompts.set_base_dir(tmp_path)
+    for i in range(1, 8):
+        prompts.save("p", f"text {i}", metadata={"i": i})
+
+    assert prompts.pack("p", keep=2) == 5
+    vdir = tmp_path / "p" / "versions"
+    assert sorted(f.name for f in vdir.glob("v*.txt")) == ["v0006.txt", "v0007.txt"]
+    assert not (vdir / "v0001.json").exists()
+
+    for i in range(1, 8):
+        assert prompts.read_version("p", f"v{i:04d}") == f"text {i}"
+    assert prompts.read_version("p", "v0003.txt") == "text 3"
+    assert prompts.meta("p", "v0002")["metadata"] == {"i": 2}
+    assert len(prompts.versions("p", with_meta=True)) == 7
+
+    # appending later versions keeps earlier offsets valid
+    prompts.save("p", "text 8")
+    assert prompts.pack_all(keep=1) == {"p": 2}
+    assert prompts.read_version("p", "v0001") == "text 1"
+    assert prompts.read_version("p", "v0007") == "text 7"
+    with pytest.raises(FileNotFoundError):
+        prompts.read_version("p", "v0042")
+
+    # the index can be recovered from the pack
+    (vdir / "index.jsonl").unlink()
+    assert prompts.rebuild_index("p") == 8
+    assert prompts.save("p", "text 9")["version"] == "v0009"
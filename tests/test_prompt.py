@@ -181,3 +181,23 @@ def test_format_prompt_specific_version(tmp_path):
 
     assert v1_formatted == "Hello Bob!"
     assert v2_formatted == "Greetings Bob! How are you?"
+
+def test_prompt_shares_the_core_store(tmp_path, capsys, monkeypatch):
+    from parolo import prompts
+    Prompt.set_base_dir(tmp_path / "prompts")
+    prompts.set_base_dir(tmp_path / "prompts")
+
+    Prompt.create("shared", "One {x}")
+    prompts.save("shared", "Two {x}")
+    Prompt.create("shared", "Two {x}")  # unchanged
+    assert capsys.readouterr().out == ""  # silent by default
+
+    assert Prompt.list_versions("shared") == prompts.versions("shared") == ["v0001.txt", "v0002.txt"]
+    assert Prompt.get_metadata("shared", "v0002.txt") == prompts.meta("shared", "v0002")
+    prompts.pack("shared", keep=0)
+    assert Prompt.format_prompt("shared", version="v0001", x=1) == "One 1"
+    assert Prompt.overview() == {"shared": 2}
+
+    monkeypatch.setattr(Prompt, "verbose", True)
+    Prompt.create("shared", "Three {x}")
+    assert "v0003.txt" in capsys.readouterr().out
@@ -0,0 +1,97 @@
+# tests/test_sqlite.py
+import io
+import threading
+import pytest
+
+try:
+    from parolo import prompts, tenants
+    from parolo.sqlite_store import SQLiteBackend
+except Exception:
+    pytest.skip("prompts namespace not available", allow_module_level=True)
+
+pytest.importorskip("jinja2")
+
+
+@pytest.fixture
+def db(tmp_path):
+    prompts.set_base_dir(tmp_path / "files")
+    backend = prompts.use_backend(SQLiteBackend(tmp_path / "prompts.db"))
+    yield backend
+    prompts.use_backend(None)
+
+
+def test_sqlite_backend_matches_file_api(db, tmp_path):
+    assert prompts.save("greet", "Hello {{ name }}!", metadata={"a": 1})["version"] == "v0001"
+    assert prompts.save("greet", "Hello {{ name }}!")["version"] == "v0001"  # unchanged
+    info = prompts.save("greet", "Hi {{ name }}!")
+    assert info == {"version": "v0002", "hash": info["hash"], "size": 14, "lines": 1}
+
+    assert prompts.read("greet") == "Hi {{ name }}!"
+    assert prompts.read_version("greet", "v0001.txt") == "Hello {{ name }}!"
+    assert prompts.render("greet", name="Ada") == "Hi Ada!"
+    assert prompts.versions("greet") == ["v0001.txt", "v0002.txt"]
+    m = prompts.meta("greet", "v0001")
+    assert m["metadata"] == {"a": 1} and m["jinja_variables"] == ["name"]
+    assert prompts.meta("greet", "v0002")["previous_hash"] == m["hash"]
+    assert prompts.list() == [{"name": "greet", "versions": 2, "has_latest": True,
+                               "latest_version": "v0002", "hash": info["hash"],
+                               "timestamp": prompts.meta("greet", "v0002")["timestamp"],
+                               "size": 14, "line_count": 1}]
+
+    t = prompts.token("greet")
+    prompts.save("greet", "Hey {{ name }}!")
+    assert prompts.token("greet") > t and prompts.token("nope") == 0
+    assert prompts.render("greet", name="Ada") == "Hey Ada!"
+    with pytest.raises(FileNotFoundError):
+        prompts.read("nope")
+    with pytest.raises(FileNotFoundError):
+        prompts.read_version("greet", "v0009")
+    with pytest.raises(io.UnsupportedOperation):
+        prompts.pack("greet")
+
+    tenants.save("acme", "bot", "A", semver="1.0.0")
+    tenants.save("acme", "bot", "B", semver="1.1.0")
+    assert tenants.read("acme", "bot", semver="1.x") == "B"
+    assert not (tmp_path / "files").exists()  # nothing touched the file store
+
+
+def test_sqlite_save_many_and_concurrent_writers(db):
+    out = prompts.save_many([("a", "1"), ("b", "x"), ("a", "2"), ("a", "2")])
+    assert [r["version"] for r in out] == ["v0001", "v0001", "v0002", "v0002"]
+
+    def writer(i):
+        for j in range(20):
+            prompts.save("shared", f"writer {i} edit {j}")
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(4)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    assert prompts.versions("shared") == [f"v{n:04d}.txt" for n in range(1, 81)]
+
+
+def test_sqlite_generation(db):
+    from parolo import _core
+    prompts.save("a", "1")
+    g = _core.generation()
+    prompts.save("a", "1")
+    assert _core.generation() == g
+    prompts.save("b", "2")
+    prompts.save("c", "3")
+    g2, changed = _core.changes_since(g)
+    assert changed == {"b", "c"} and g2 == _core.generation() > g
+
+
+def test_incomplete_backend_cannot_be_constructed():
+    from parolo._core import Backend
+
+    class NoToken(Backend):
+        def put(self, name, text, metadata=None): ...
+        def get(self, name): ...
+        def get_version(self, name, version): ...
+        def entries(self, name): ...
+        def names(self): ...
+
+    with pytest.raises(TypeError):
+        NoToken()
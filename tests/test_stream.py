@@ -0,0 +1,43 @@
+# tests/test_stream.py
+import io
+import socket
+import pytest
+
+try:
+    from parolo import prompts
+except Exception:
+    pytest.skip("prompts namespace not available", allow_module_level=True)
+
+pytest.importorskip("jinja2")
+
+SRC = "Examples for {{ task }}:\n{% for i in range(n) %}example {{ i }}: {{ shot }}\n{% endfor %}Done."
+
+
+def test_render_stream_matches_render(tmp_path):
+    prompts.set_base_dir(tmp_path)
+    prompts.save("fewshot", SRC)
+    ctx = dict(task="t", n=500, shot="x" * 50)
+    full = prompts.render("fewshot", **ctx)
+
+    chunks = list(prompts.render_stream("fewshot", chunk_size=4096, **ctx))
+    assert "".join(chunks) == full
+    assert len(chunks) > 1 and all(len(c) < 4096 + 100 for c in chunks)
+
+    prompts.save("fewshot", "changed")
+    assert "".join(prompts.render_version_stream("fewshot", "v0001", **ctx)) == full
+    with pytest.raises(Exception):  # StrictUndefined, raised while streaming
+        list(prompts.render_version_stream("fewshot", "v0001", n=3))
+
+
+def test_render_to_files_and_sockets(tmp_path):
+    prompts.set_base_dir(tmp_path)
+    prompts.save("p", "Grüße {{ name }}")
+    text, raw = io.StringIO(), io.BytesIO()
+    assert prompts.render_to("p", text, name="Ada") == len("Grüße Ada")
+    assert prompts.render_to("p", raw, name="Ada") == len("Grüße Ada".encode("utf-8"))
+    assert text.getvalue() == raw.getvalue().decode("utf-8") == "Grüße Ada"
+
+    a, b = socket.socketpair()
+    with a, b:
+        n = prompts.render_to("p", a, version="v0001", name="Bo")
+        assert b.recv(n) == "Grüße Bo".encode("utf-8")
@@ -57,6 +57,21 @@ def test_list_semvers_order_and_auto_increment(tmp_path, monkeypatch):
     assert semvers == ["1.0.0", "1.0.1", "1.0.2"]
 
 
+def test_semver_maps_are_bounded(tmp_path, monkeypatch):
+    import importlib
+    setup_tmp(monkeypatch, tmp_path)
+    mod = importlib.import_module("parolo.tenants")
+    tenants.configure_cache(semver_maxsize=2)
+    try:
+        for i in range(5):
+            tenants.save(f"t{i}", "bot", f"T{i}", semver="2.0.0")
+            assert tenants.read(f"t{i}", "bot", semver="2.0.0") == f"T{i}"
+        assert len(mod._semvers._data) == 2
+        assert tenants.read("t0", "bot", semver="2.0.x") == "T0"  # evicted: reloaded
+    finally:
+        tenants.configure_cache(semver_maxsize=10000)
+
+
 def test_ensure_initial_and_no_overwrite(tmp_path, monkeypatch):
     setup_tmp(monkeypatch, tmp_path)
 
@@ -106,3 +121,79 @@ def test_read_cached_updates_on_change(tmp_path, monkeypatch):
     tenants.save("t3", "a", "two", semver="1.0.1")
     v2 = tenants.read_cached("t3", "a")
     assert v2 == "two"
+
+
+def test_semver_map_and_ranges(tmp_path, monkeypatch):
+    setup_tmp(monkeypatch, tmp_path)
+
+    tenants.save("t4", "a", "A", semver="1.2.0")
+    tenants.save("t4", "a", "B", semver="1.2.3")
+    tenants.save("t4", "a", "C", semver="1.10.0")
+    tenants.save("t4", "a", "D", semver="2.0.0-rc1")
+
+    smap = (tmp_path / "t4_a" / "semver.json").read_text()
+    assert '"1.2.3": "v0002"' in smap
+
+    assert tenants.read("t4", "a", semver="1.2.3") == "B"
+    assert tenants.resolve("t4", "a", "1.2.x") == "1.2.3"
+    assert tenants.resolve("t4", "a", "1.*") == "1.10.0"
+    assert tenants.resolve("t4", "a", "2") == "2.0.0-rc1"
+    assert tenants.resolve("t4", "a", "3.x") is None
+    assert tenants.read("t4", "a", semver="1.2.x") == "B"
+
+    # versions saved through prompts.save are picked up from the index
+    prompts.save("t4_a", "E", metadata={"semver": "1.2.9"})
+    assert tenants.read("t4", "a", semver="1.2.9") == "E"
+
+
+def test_read_cached_bounded_negative_and_window(tmp_path, monkeypatch):
+    setup_tmp(monkeypatch, tmp_path)
+    tenants.configure_cache(maxsize=2, maxbytes=10_000, revalidate_ms=60_000)
+    try:
+        with pytest.raises(FileNotFoundError):
+            tenants.read_cached("t5", "a")
+        tenants.save("t5", "a", "one")  # own saves drop the negative entry
+        assert tenants.read_cached("t5", "a") == "one"
+
+        # within the window a hit needs no stat: a change behind its back is not seen...
+        prompts.save("t5_a", "two")
+        assert tenants.read_cached("t5", "a") == "one"
+        tenants.invalidate("t5", "a")  # ...until invalidated explicitly
+        assert tenants.read_cached("t5", "a") == "two"
+
+        for agent in "bcd":
+            tenants.save("t5", agent, agent * 100)
+            tenants.read_cached("t5", agent)
+        info = tenants.cache_info()
+        assert info["size"] == 2 and info["evictions"] >= 2 and info["bytes"] <= 10_000
+
+        tenants.configure_cache(maxbytes=200)
+        tenants.read_cached("t5", "b")
+        tenants.read_cached("t5", "c")
+        assert tenants.cache_info()["size"] == 1  # two 100-char texts do not fit
+    finally:
+        tenants.configure_cache(maxsize=10000, maxbytes=64 << 20, revalidate_ms=0)
+
+
+def test_read_cached_validated_by_store_generation(tmp_path, monkeypatch):
+    setup_tmp(monkeypatch, tmp_path)
+    tenants.save("t6", "a", "A")
+    tenants.save("t6", "b", "B")
+    assert tenants.read_cached("t6", "a") == "A" and tenants.read_cached("t6", "b") == "B"
+
+    # one journal check validates both entries: no per-prompt stat
+    (tmp_path / "t6_a" / "latest.txt").unlink()
+    assert tenants.read_cached("t6", "a") == "A"
+
+    prompts.save("t6_b", "B2")  # journaled write: only t6_b is re-read
+    assert tenants.read_cached("t6", "b") == "B2"
+    assert tenants.read_cached("t6", "a") == "A"
+
+    # a write that bypasses the journal is seen once the entry outlives the max age
+    import importlib
+    from parolo import _core
+    monkeypatch.setattr(_core, "_journal_append", lambda root, names: None)
+    prompts.save("t6_b", "B3")
+    assert tenants.read_cached("t6", "b") == "B2"
+    monkeypatch.setattr(importlib.import_module("parolo.tenants"), "_max_age_ns", 0)
+    assert tenants.read_cached("t6", "b") == "B3"
@@ -0,0 +1,44 @@
+# tests/test_validate.py
+import pytest
+
+try:
+    from parolo import prompts, MissingVariablesError
+except Exception:
+    pytest.skip("prompts namespace not available", allow_module_level=True)
+
+pytest.importorskip("jinja2")
+
+
+def test_validate_before_rendering(tmp_path, monkeypatch):
+    prompts.set_base_dir(tmp_path)
+    prompts.save("p", "{% for i in items %}{{ greeting }} {{ i }}{% endfor %}")
+    assert prompts.vars("p") == ["greeting", "items"]
+
+    prompts.validate("p", {"greeting": "hi", "items": []})
+    with pytest.raises(MissingVariablesError) as e:
+        prompts.validate("p", {"items": [1]})
+    assert isinstance(e.value, KeyError) and e.value.missing == ["greeting"]
+    assert "greeting" in str(e.value)
+    with pytest.raises(MissingVariablesError):
+        prompts.render_checked("p", {"items": [1]})
+    assert prompts.render_checked("p", {"greeting": "hi", "items": [1]}) == "hi 1"
+
+    prompts.save("p", "{{ other }}")
+    prompts.validate("p", {"greeting": "hi", "items": []}, version="v0001")
+    with pytest.raises(MissingVariablesError):
+        prompts.render_checked("p", {"items": []}, version="v0001")
+    prompts.save("q", "{{ validate }} {{ version }}")  # any variable name works
+    assert prompts.render_checked("q", {"validate": 1, "version": 2}) == "1 2"
+    assert prompts.render("q", validate=1, version=2) == "1 2"
+
+
+def test_render_many_rejects_bad_rows_before_rendering(tmp_path):
+    prompts.set_base_dir(tmp_path)
+    prompts.save("p", "{{ a }}-{{ b }}")
+    rows = [{"a": 1, "b": 2}, {"a": 3}, {"a": 5, "b": 6}]
+    with pytest.raises(MissingVariablesError) as e:  # raised by the call, before any next()
+        prompts.render_many("p", rows, validate=True, workers=1, chunksize=1)
+    assert e.value.row == 1 and e.value.missing == ["b"]
+    with pytest.raises(FileNotFoundError):
+        prompts.render_many("nope", rows)
+    assert list(prompts.render_many("p", rows[::2], validate=True)) == ["1-2", "5-6"]
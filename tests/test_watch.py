@@ -0,0 +1,84 @@
+# tests/test_watch.py
+import sys
+import threading
+import pytest
+
+try:
+    from parolo import prompts, tenants
+except Exception:
+    pytest.skip("prompts namespace not available", allow_module_level=True)
+
+BACKENDS = [False] + ([True] if sys.platform.startswith("linux") else [])
+
+
+@pytest.mark.parametrize("inotify", BACKENDS)
+def test_watch_one_prompt(tmp_path, inotify):
+    prompts.set_base_dir(tmp_path)
+    prompts.save("w", "one")
+    with prompts.watch("w", interval=0.05, inotify=inotify) as w:
+        assert w.backend == ("inotify" if inotify else "poll")
+        assert w.poll(0.05) == []
+        prompts.save("w", "two")
+        prompts.save("other", "x")
+        changes = w.poll(0.2)
+    assert [c.name for c in changes] == ["w"]
+    assert changes[0].token == prompts.token("w")
+
+
+@pytest.mark.parametrize("inotify", BACKENDS)
+def test_watch_store_sees_new_prompts(tmp_path, inotify):
+    prompts.set_base_dir(tmp_path)
+    seen = []
+    done = threading.Event()
+
+    def on_change(change):
+        seen.append(change.name)
+        done.set()
+
+    w = prompts.watch(callback=on_change, interval=0.05, inotify=inotify)
+    try:
+        prompts.save("fresh", "hello")
+        assert done.wait(5.0)
+    finally:
+        w.close()
+    assert seen[0] == "fresh"
+
+
+def test_watch_invalidates_read_cache(tmp_path):
+    prompts.set_base_dir(tmp_path)
+    tenants.save("t", "a", "one")
+    tenants.configure_cache(revalidate_ms=60_000)  # only an invalidation can refresh the entry
+    try:
+        assert tenants.read_cached("t", "a") == "one"
+        with prompts.watch("t_a", interval=0.05, inotify=False) as w:
+            prompts.save("t_a", "two")
+            assert w.poll(0.05)
+        assert tenants.cache_info()["size"] == 0
+        assert tenants.read_cached("t", "a") == "two"
+    finally:
+        tenants.configure_cache(revalidate_ms=0)
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux only")
+def test_watch_polls_network_mounts_and_survives_watch_limit(tmp_path, monkeypatch):
+    import errno
+    from parolo import watch as watch_mod
+    prompts.set_base_dir(tmp_path)
+
+    monkeypatch.setattr(watch_mod, "_network_fs", lambda path: True)
+    with prompts.watch(interval=0.05) as w:
+        assert w.backend == "poll"
+    monkeypatch.undo()
+
+    with prompts.watch(interval=0.05) as w:
+        assert w.backend == "inotify"
+
+        def full(self, path, mask):
+            raise OSError(errno.ENOSPC, "No space left on device")
+        monkeypatch.setattr(watch_mod._Inotify, "add", full)
+        prompts.save("late", "x")  # arming the new prompt hits the watch limit
+        changes = w.poll(0.2) + w.poll(0.05)
+        assert w.backend == "poll"
+        assert [c.name for c in changes] == ["late"]
+        prompts.save("late", "y")
+        assert [c.name for c in w.poll(0.05)] == ["late"]